@@ -0,0 +1,76 @@
+"""Benchmark: projection-based margin cropping vs the contour-based path.
+
+Builds large synthetic scan pages (optionally sprinkled with noise, which is what
+makes ``cv2.findContours`` return thousands of contours) and times
+``ImageConverter.crop_countors`` against ``ImageConverter.crop_margins`` (see
+``legacy_converter.py``; the package only keeps the projection in ``content_box``).
+
+Usage (from the repository root, with the package installed, e.g. ``pip install -e .``):
+
+    python benchmarks/bench_cropping.py [--width 2400] [--height 3600] [--repeat 10]
+"""
+
+import argparse
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from legacy_converter import ImageConverter
+
+
+def make_page(width, height, noise, seed=0):
+    """Return a grayscale page with a dark content block and optional speckle noise."""
+    rng = np.random.default_rng(seed)
+    page = np.full((height, width), 255, dtype=np.uint8)
+    top, left = height // 10, width // 12
+    page[top:height - top, left:width - left] = rng.integers(
+        0, 200, size=(height - 2 * top, width - 2 * left), dtype=np.uint8
+    )
+    if noise:
+        # Isolated dark specks inside the margins, one contour each
+        ys = rng.integers(0, height, size=noise)
+        xs = rng.integers(0, width, size=noise)
+        page[ys, xs] = 0
+    buffer = BytesIO()
+    Image.fromarray(page).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def time_crop(content, method, repeat):
+    """Return (best seconds, cropped size) for ``method`` over ``repeat`` runs."""
+    best, size = float("inf"), None
+    for _ in range(repeat):
+        imgc = ImageConverter(BytesIO(content))
+        imgc.b_img.load()
+        start = time.perf_counter()
+        getattr(imgc, method)(img_is_grayscale=True)
+        # PIL crops lazily, force the pixels so both paths do the same work
+        imgc.b_img.load()
+        best = min(best, time.perf_counter() - start)
+        size = imgc.b_img.size
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=2400)
+    parser.add_argument("--height", type=int, default=3600)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"page {args.width}x{args.height}, best of {args.repeat}")
+    print(f"{'noise specks':>12} | {'contours ms':>11} | {'projection ms':>13} | {'speedup':>7} | same box")
+    for noise in (0, 1_000, 20_000):
+        content = make_page(args.width, args.height, noise)
+        contour_s, contour_size = time_crop(content, "crop_countors", args.repeat)
+        proj_s, proj_size = time_crop(content, "crop_margins", args.repeat)
+        print(
+            f"{noise:>12} | {contour_s * 1000:>11.2f} | {proj_s * 1000:>13.2f} | "
+            f"{contour_s / proj_s:>6.1f}x | {contour_size == proj_size}"
+        )
+
+
+if __name__ == "__main__":
+    main()
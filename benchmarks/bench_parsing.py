@@ -0,0 +1,172 @@
+"""Benchmark: HTML parsing of every scraper with each BeautifulSoup backend.
+
+The scrapers used to build a full ``html.parser`` tree of every page before
+reading a handful of tags. They now parse only the tags they read
+(``SoupStrainer``) with the fastest backend installed. For each site and page
+kind this reports the old full-tree parse against the current parse function
+with every available backend, and checks that all backends extract the same
+result.
+
+Only the parse step is timed, on HTML already in memory: fetching the page
+(browser rendering or the HTTP fast path) is not measured, and it usually
+costs far more than parsing, so the speedups shown are not speedups of a
+whole search or chapter lookup. The old column only builds the tree, without
+reading the tags from it. (When the browser is used, the scrapers now also
+serialize only the matching elements instead of the whole document, so the
+parsed input there is even smaller than the pages measured here.)
+
+The pages are synthetic by default, built to mimic each site's markup with
+``--chapters`` chapter links and ``--pages`` page images plus the usual page
+chrome. Real pages saved from a browser can be used instead by passing a
+folder holding ``<site>_<kind>.html`` files (e.g. ``weeb_central_chapters.html``);
+missing files fall back to the synthetic ones.
+
+Usage (from the repository root, with the package installed, e.g. ``pip install -e .[fast]``):
+
+    python benchmarks/bench_parsing.py [--fixtures DIR] [--chapters 2000] [--pages 60] [--repeat 5]
+"""
+
+import argparse
+import importlib.util
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from kizamumanga.scraping import inmanga, leermangaesp, weeb_central
+
+CHROME = (
+    "<head><title>Reader</title>"
+    + "".join(f'<script src="/static/app{i}.js"></script>' for i in range(20))
+    + "<style>" + "body{margin:0}" * 200 + "</style></head>"
+    + "<nav>" + "".join(f'<div class="menu"><a href="/m{i}">Menu {i}</a></div>' for i in range(80)) + "</nav>"
+)
+FOOTER = "<footer>" + "".join(f"<p>Footer line {i}</p>" for i in range(100)) + "</footer>"
+
+
+def page(body: str) -> str:
+    """Wrap ``body`` with the navigation, scripts and footer of a real page."""
+    return f"<!DOCTYPE html><html>{CHROME}<body><main>{body}</main>{FOOTER}</body></html>"
+
+
+def weeb_central_fixtures(chapters, pages):
+    chapter_a = (
+        '<div class="flex items-center"><a class="hover:bg-base-300 flex-1 flex items-center p-2" '
+        'href="https://weebcentral.com/chapters/{i:08d}"><svg viewBox="0 0 24 24"><path d="M0 0h24"/></svg>'
+        '<span class="grow flex items-center gap-2"><span class="">Chapter {i}</span></span>'
+        '<span class="opacity-50">2024-01-01</span></a></div>'
+    )
+    return {
+        "search": page("<section id='search-results'>" + "".join(
+            f'<article><a class="line-clamp-1 link" href="https://weebcentral.com/series/{i}/x">Manga {i}</a>'
+            f'<img src="/cover/{i}.webp" alt="cover"><p>Synopsis {i}</p></article>' for i in range(32)
+        ) + "</section>"),
+        "chapters": page("<div id='chapter-list'>" + "".join(
+            chapter_a.format(i=i) for i in range(chapters, 0, -1)
+        ) + "</div>"),
+        "pages": page("<section class='reader'>" + "".join(
+            f'<img src="https://cdn.example.com/{i:03d}.png" alt="Page {i}" class="maw-w-full">'
+            for i in range(1, pages + 1)
+        ) + "</section>"),
+    }
+
+
+def inmanga_fixtures(chapters, pages):
+    return {
+        "search": page("<div id='MangaConsultResult'>" + "".join(
+            f'<a class="manga-result" href="ver/manga/Manga-{i}/{i}"><img class="lazy" '
+            f'alt="Manga {i} Manga Online - InManga" data-src="/c/{i}.jpg"><h4>Manga {i}</h4></a>'
+            for i in range(20)
+        ) + "</div>"),
+        "chapters": page("<div id='ChaptersContainer'>" + "".join(
+            f'<a class="viewed-chapter" data-c-number="{i}" href="/ver/manga/x/{i}/id{i}">'
+            f'<div class="chapter-title"><span>Capitulo {i}</span><small>2024</small></div></a>'
+            for i in range(chapters, 0, -1)
+        ) + "</div>"),
+        "pages": page("<div class='PagesContainer'>" + "".join(
+            f'<a class="NextPage"><img class="ImageContainer" alt="Manga X - InManga" '
+            f'src="https://pack-yak.intomanga.com/images/{i}.jpg"></a>'
+            for i in range(1, pages + 1)
+        ) + "</div>"),
+    }
+
+
+def leermangaesp_fixtures(chapters, pages):
+    return {
+        "search": page("<div class='results'>" + "".join(
+            f'<div class="manga-item"><a href="/manga/{i}"><img src="/c/{i}.jpg"></a><h3>Manga {i}</h3></div>'
+            for i in range(24)
+        ) + "</div>"),
+        "chapters": page("<div class='chapters'>" + "".join(
+            f'<div class="chapter-card"><a class="chapter-link" href="/manga/x/{i}" '
+            f'aria-label="Capitulo {i}"><span>Capitulo {i}</span></a></div>'
+            for i in range(chapters, 0, -1)
+        ) + "</div>"),
+        "pages": page("<div id='cascade-view'>" + "".join(
+            f'<img class="manga-image" alt="Pagina {i}" src="https://cdn.example.com/{i}.webp">'
+            for i in range(1, pages + 1)
+        ) + "</div>"),
+    }
+
+
+SITES = {
+    "weeb_central": (weeb_central, weeb_central_fixtures),
+    "inmanga": (inmanga, inmanga_fixtures),
+    "leermangaesp": (leermangaesp, leermangaesp_fixtures),
+}
+PARSERS = {"search": "_parse_search", "chapters": "_parse_chapters", "pages": "_parse_pages"}
+
+
+def best_of(func, repeat):
+    """Return the best wall time of ``repeat`` calls to ``func``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", help="Folder with saved <site>_<kind>.html pages")
+    parser.add_argument("--chapters", type=int, default=2000)
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = ["html.parser"]
+    if importlib.util.find_spec("lxml") is not None:
+        backends.insert(0, "lxml")
+    else:
+        print("lxml is not installed, only html.parser is measured (pip install lxml)\n")
+
+    print(f"{'page':<24}{'KB':>7}{'old tree parse':>15}" + "".join(f"{b:>14}" for b in backends) + f"{'parse speedup':>15}")
+    for site, (module, make_fixtures) in SITES.items():
+        fixtures = make_fixtures(args.chapters, args.pages)
+        for kind, func_name in PARSERS.items():
+            html = fixtures[kind]
+            if args.fixtures:
+                path = os.path.join(args.fixtures, f"{site}_{kind}.html")
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        html = f.read()
+            parse = getattr(module, func_name)
+
+            results = [parse(html, backend) for backend in backends]
+            if any(result != results[0] for result in results):
+                raise SystemExit(f"{site} {kind}: backends extracted different results")
+
+            old = best_of(lambda: BeautifulSoup(html, "html.parser"), args.repeat)
+            times = [best_of(lambda b=b: parse(html, b), args.repeat) for b in backends]
+            print(
+                f"{site + ' ' + kind:<24}{len(html) / 1024:>7.0f}{old * 1000:>12.1f} ms"
+                + "".join(f"{t * 1000:>11.1f} ms" for t in times)
+                + f"{old / min(times):>14.1f}x"
+            )
+            if not results[0]:
+                print(f"  warning: nothing extracted from {site} {kind}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark: fused process_image pipeline vs the chained ImageConverter calls.
+
+The chained path is what the downloader used to run for every page:
+``grayscale`` -> ``crop_countors`` -> ``resize`` -> ``retrieve_buffered_img``,
+each step converting between PIL images and NumPy arrays. ``process_image``
+decodes once, crops through the resize box and encodes once.
+
+For every configuration it reports the best per-page latency and the peak of
+memory traced by ``tracemalloc`` (NumPy arrays and Python objects; PIL's own
+bitmaps are allocated in C and are not traced, so the real gap is larger).
+
+Usage (from the repository root, with the package installed, e.g. ``pip install -e .``):
+
+    python benchmarks/bench_pipeline.py [--width 1800] [--height 2700] [--repeat 10]
+"""
+
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from kizamumanga.engine.image_converter import process_image
+from legacy_converter import ImageConverter
+
+
+def make_page(width, height, seed=0):
+    """Return a colour JPEG page with white margins around a textured content block."""
+    rng = np.random.default_rng(seed)
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    top, left = height // 10, width // 12
+    block = rng.integers(0, 200, size=(height // 20, width // 20, 3), dtype=np.uint8)
+    block = np.kron(block, np.ones((20, 20, 1), dtype=np.uint8))
+    page[top:height - top, left:width - left] = block[: height - 2 * top, : width - 2 * left]
+    buffer = BytesIO()
+    Image.fromarray(page).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def chained(content, color, cropping_mode, width, height):
+    """Previous per-page processing built from ImageConverter calls."""
+    imgc = ImageConverter(BytesIO(content))
+    if not color:
+        imgc.grayscale()
+    if cropping_mode:
+        imgc.crop_countors(img_is_grayscale=not color)
+    if width is not None and height is not None:
+        imgc.resize(width=width, height=height)
+    return imgc.retrieve_buffered_img().getvalue()
+
+
+def fused(content, color, cropping_mode, width, height):
+    """Fused single-decode pipeline."""
+    return process_image(content, color, cropping_mode, width, height)[0]
+
+
+def measure(func, content, settings, repeat):
+    """Return (best seconds, peak traced bytes, output size) for ``func``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content, **settings)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    output = func(content, **settings)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=1800)
+    parser.add_argument("--height", type=int, default=2700)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    content = make_page(args.width, args.height)
+    configurations = {
+        "grayscale+crop+resize": dict(color=False, cropping_mode=True, width=1264, height=1680),
+        "grayscale+crop": dict(color=False, cropping_mode=True, width=None, height=None),
+        "color+crop+resize": dict(color=True, cropping_mode=True, width=1264, height=1680),
+    }
+
+    print(f"page {args.width}x{args.height} JPEG, best of {args.repeat}")
+    print(f"{'configuration':<22} | {'path':<7} | {'ms/page':>8} | {'traced peak MB':>14} | {'output KB':>9}")
+    for name, settings in configurations.items():
+        for label, func in (("chained", chained), ("fused", fused)):
+            seconds, peak, size = measure(func, content, settings, args.repeat)
+            print(
+                f"{name:<22} | {label:<7} | {seconds * 1000:>8.1f} | "
+                f"{peak / 1_048_576:>14.1f} | {size / 1024:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
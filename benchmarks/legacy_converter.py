@@ -0,0 +1,124 @@
+"""Chained ImageConverter the downloader used before ``process_image``, kept as benchmark baseline.
+
+Not part of the package: each call converts between PIL images and NumPy
+arrays, which is what the fused pipeline avoids.
+"""
+from io import BytesIO
+import numpy as np
+import cv2
+from PIL import Image
+
+from kizamumanga.engine.image_converter import content_box, encode_image, fit_size
+from kizamumanga.utils import Logger
+
+logger = Logger("benchmarks.legacy_converter")
+
+
+class ImageConverter:
+    """Applies image transformations including resize, grayscale, and content-aware crop."""
+
+    def __init__(self, img_buffer):
+        """Initialize with a path to the image to be processed."""
+        self.logger = logger
+        self.b_img = Image.open(img_buffer)
+        self.output_buffer = BytesIO()
+
+    def resize(self, width, height):
+        """Resize the image while preserving aspect ratio."""
+        try:
+            img = self.b_img
+            size = fit_size(img.width, img.height, width, height)
+            self.b_img = img.resize(size, resample=Image.Resampling.LANCZOS)
+
+        except OSError as e:
+            self.logger.exception(f"Resize failed for {self.b_img}: {e}")
+            raise RuntimeError from e
+
+    def grayscale(self):
+        """Convert the image to grayscale and overwrite the original."""
+        try:
+            img = np.array(self.b_img)
+        except OSError as e:
+            self.logger.exception(f"Resize failed for {self.b_img}: {e}")
+            raise RuntimeError from e
+        
+        if img is None:
+            self.logger.error("Image could not be loaded for grayscale conversion")
+            raise ValueError("Image could not be loaded for grayscale conversion")
+
+        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        self.b_img = Image.fromarray(gray)
+
+    def crop_countors(self, padding=10, img_is_grayscale=False):
+        """Crop margins by detecting contours in the image content."""
+        try:
+            image = np.array(self.b_img)
+
+            if image is None:
+                self.logger.error("Image could not be loaded for cropping")
+                return
+
+            if img_is_grayscale:
+                grey = image.copy()
+            else:
+                grey = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+            _, thresh = cv2.threshold(grey, 250, 255, cv2.THRESH_BINARY_INV)
+            contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+            if not contours:
+                self.logger.warning(f"No contours found")
+                return
+
+            x_min, y_min, x_max, y_max = image.shape[1], image.shape[0], 0, 0
+            for cnt in contours:
+                x, y, w, h = cv2.boundingRect(cnt)
+                x_min = min(x_min, x)
+                y_min = min(y_min, y)
+                x_max = max(x_max, x + w)
+                y_max = max(y_max, y + h)
+
+            x_min = max(x_min - padding, 0)
+            y_min = max(y_min - padding, 0)
+            x_max = min(x_max + padding, image.shape[1])
+            y_max = min(y_max + padding, image.shape[0])
+
+            cropped = image[y_min:y_max, x_min:x_max]
+            self.b_img = Image.fromarray(cropped)
+        except Exception as e:
+            self.logger.error(f"Cropping failed: {e}")
+
+    def crop_margins(self, padding=10, img_is_grayscale=False, threshold=250):
+        """Crop margins using row/column projections of the page content.
+
+        Same result as ``crop_countors`` (the union of the external contours'
+        bounding boxes is the bounding box of every pixel darker than
+        ``threshold``) without tracing contours, so noisy scans cost the same
+        as clean ones.
+        """
+        try:
+            image = np.asarray(self.b_img)
+
+            if img_is_grayscale or image.ndim == 2:
+                grey = image
+            elif image.shape[2] == 4:
+                grey = cv2.cvtColor(image, cv2.COLOR_RGBA2GRAY)
+            else:
+                grey = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+            box = content_box(grey, padding, threshold)
+            if box is None:
+                self.logger.warning("No content found")
+                return
+
+            self.b_img = self.b_img.crop(box)
+        except Exception as e:
+            self.logger.error(f"Cropping failed: {e}")
+
+    def retrieve_buffered_img(self, output_format="png", quality=85, png_compress_level=6, webp_method=4):
+        """Encode the image with the selected codec and return the buffer."""
+        encode_image(
+            self.b_img, self.output_buffer, output_format,
+            quality, png_compress_level, webp_method
+        )
+        return self.output_buffer
@@ -1,4 +1,4 @@
 from .runner import Runner
 from .downloader import MangaDownloader
 from .config import Config
-from .paths import CONFIG_PATH,CBZ_PATH,PROJECT_ROOT, TEMP_PATH
\ No newline at end of file
+from .paths import CONFIG_PATH,CBZ_PATH,PROJECT_ROOT, TEMP_PATH, CACHE_PATH
\ No newline at end of file
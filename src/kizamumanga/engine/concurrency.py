@@ -0,0 +1,116 @@
+"""Concurrency limit that adapts to how the websites respond (AIMD)."""
+
+import asyncio
+from collections import deque
+
+import aiohttp
+
+from ..utils import Logger
+
+
+def is_overload(error: BaseException) -> bool:
+    """True for errors meaning the site is overloaded: timeouts, 429 and 5xx answers.
+
+    Other failures, such as a 404 or a broken image, say nothing about the
+    load and must not lower a limit.
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return False
+
+
+class AdaptiveLimit:
+    """Caps the tasks running at once, moving the cap between 1 and ``ceiling``.
+
+    Used as ``async with limit:`` like a semaphore, with ``record`` called
+    after each operation. Every ``window`` recorded operations the limit is
+    re-evaluated: additive increase (+1) while overloads stay rare and
+    latency stays near the best seen so far, multiplicative decrease
+    (halved) as soon as overloads pile up or latency doubles. When not
+    ``adaptive`` it is a plain semaphore of ``ceiling``.
+    """
+
+    # Share of overloaded operations in a window that triggers a decrease
+    ERROR_RATE = 0.1
+    # Window latency, relative to the best window seen, that triggers a decrease
+    LATENCY_FACTOR = 2.0
+
+    def __init__(self, name: str, ceiling: int, adaptive: bool = True, window: int = 8):
+        """Start at half of ``ceiling`` when adaptive, at ``ceiling`` otherwise."""
+        self.logger = Logger("engine.concurrency")
+        self.name = name
+        self.ceiling = max(1, ceiling)
+        self.adaptive = adaptive
+        self.window = window
+        self.limit = max(1, self.ceiling // 2) if adaptive else self.ceiling
+        self.in_flight = 0
+        self._waiters = deque()
+        self._latencies = []
+        self._errors = 0
+        self._baseline = None
+        if adaptive:
+            self.logger.info(f"{self.name}: adaptive limit starting at {self.limit}/{self.ceiling}")
+
+    async def __aenter__(self):
+        while self.in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.in_flight -= 1
+        self.__wake()
+
+    def record(self, ok: bool, latency: float):
+        """Report the duration in seconds of one operation and whether it avoided an overload.
+
+        ``ok`` should only be False for overloads (see ``is_overload``).
+        """
+        if not self.adaptive:
+            return
+        self._latencies.append(latency)
+        self._errors += not ok
+        if len(self._latencies) >= max(self.window, self.limit):
+            self.__adjust()
+
+    def __adjust(self):
+        """Apply the increase or decrease of the window that just ended."""
+        count = len(self._latencies)
+        latency = sum(self._latencies) / count
+        errors = self._errors
+        self._latencies.clear()
+        self._errors = 0
+
+        old = self.limit
+        if errors / count > self.ERROR_RATE:
+            self.limit = max(1, self.limit // 2)
+        else:
+            # Only healthy windows count as the best latency, failures are often fast
+            if self._baseline is None or latency < self._baseline:
+                self._baseline = latency
+            if latency > self._baseline * self.LATENCY_FACTOR:
+                self.limit = max(1, self.limit // 2)
+            elif self.limit < self.ceiling:
+                self.limit += 1
+        if self.limit != old:
+            self.logger.info(
+                f"{self.name}: limit {old} -> {self.limit}/{self.ceiling} "
+                f"(errors {errors}/{count}, latency {latency:.2f} s, best {self._baseline or latency:.2f} s)"
+            )
+            # Waiters may fit under the new limit
+            self.__wake()
+
+    def __wake(self):
+        """Wake the tasks waiting for room, they check the limit again."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
@@ -1,4 +1,6 @@
 """Config module for loading and saving KizamuManga settings."""
+import os
+
 import tomlkit
 from .paths import CONFIG_PATH, CBZ_PATH
 
@@ -82,6 +84,269 @@ class Config:
         self._config["multiple_tasks"] = value
         self.save_toml()
 
+    @property
+    def resolve_tasks(self) -> int:
+        """Get max number of chapters resolved in the browser at once; default is 2."""
+        return int(self._config["resolve_tasks"]) if self._config.get("resolve_tasks", "") != "" else 2
+
+    @resolve_tasks.setter
+    def resolve_tasks(self, value):
+        """Set and save number of chapters resolved in the browser at once."""
+        self._config["resolve_tasks"] = value
+        self.save_toml()
+
+    @property
+    def host_rate_limit(self) -> float:
+        """Get max image requests per second to each host, 0 for no limit; default is 10."""
+        return (float(self._config["host_rate_limit"])
+                if self._config.get("host_rate_limit", "") != ""
+                else 10)
+
+    @host_rate_limit.setter
+    def host_rate_limit(self, value):
+        """Set and save max image requests per second to each host."""
+        self._config["host_rate_limit"] = value
+        self.save_toml()
+
+    @property
+    def adaptive_concurrency(self) -> bool:
+        """Get whether chapter and request concurrency adapt to the sites; default is False."""
+        return (self._config["adaptive_concurrency"]
+                if self._config.get("adaptive_concurrency", "") != ""
+                else False)
+
+    @adaptive_concurrency.setter
+    def adaptive_concurrency(self, value):
+        """Set and save whether chapter and request concurrency adapt to the sites."""
+        self._config["adaptive_concurrency"] = value
+        self.save_toml()
+
+    @property
+    def download_order(self) -> str:
+        """Get order chapters are resolved and downloaded in ('ascending' or 'newest_first'); default is 'ascending'."""
+        return (self._config["download_order"]
+                if self._config.get("download_order", "") != ""
+                else "ascending")
+
+    @download_order.setter
+    def download_order(self, value):
+        """Set and save order chapters are resolved and downloaded in."""
+        self._config["download_order"] = value
+        self.save_toml()
+
+    @property
+    def browser_contexts(self) -> int:
+        """Get number of browser contexts each scraper spreads its pages over; default is resolve_tasks."""
+        return (int(self._config["browser_contexts"])
+                if self._config.get("browser_contexts", "") != ""
+                else self.resolve_tasks)
+
+    @browser_contexts.setter
+    def browser_contexts(self, value):
+        """Set and save number of browser contexts of each scraper."""
+        self._config["browser_contexts"] = value
+        self.save_toml()
+
+    @property
+    def page_tasks(self) -> int:
+        """Get max number of pages fetched at once per chapter; default is 4."""
+        return int(self._config["page_tasks"]) if self._config.get("page_tasks", "") != "" else 4
+
+    @page_tasks.setter
+    def page_tasks(self, value):
+        """Set and save number of pages fetched at once per chapter."""
+        self._config["page_tasks"] = value
+        self.save_toml()
+
+    @property
+    def max_requests(self) -> int:
+        """Get max number of image requests in flight across all chapters; default is 16."""
+        return int(self._config["max_requests"]) if self._config.get("max_requests", "") != "" else 16
+
+    @max_requests.setter
+    def max_requests(self, value):
+        """Set and save max number of image requests in flight."""
+        self._config["max_requests"] = value
+        self.save_toml()
+
+    @property
+    def connections_per_host(self) -> int:
+        """Get max number of pooled connections per image host; default is 8."""
+        return (int(self._config["connections_per_host"])
+                if self._config.get("connections_per_host", "") != ""
+                else 8)
+
+    @connections_per_host.setter
+    def connections_per_host(self, value):
+        """Set and save max number of pooled connections per image host."""
+        self._config["connections_per_host"] = value
+        self.save_toml()
+
+    @property
+    def search_timeout(self) -> float:
+        """Get seconds each source has to answer a search on all sources; default is 30."""
+        return (float(self._config["search_timeout"])
+                if self._config.get("search_timeout", "") != ""
+                else 30)
+
+    @search_timeout.setter
+    def search_timeout(self, value):
+        """Set and save seconds each source has to answer a search on all sources."""
+        self._config["search_timeout"] = value
+        self.save_toml()
+
+    @property
+    def http_fast_path(self) -> bool:
+        """Get whether scrapers try plain HTTP before the browser; default is True."""
+        return (self._config["http_fast_path"]
+                if self._config.get("http_fast_path", "") != ""
+                else True)
+
+    @http_fast_path.setter
+    def http_fast_path(self, value):
+        """Set and save whether scrapers try plain HTTP before the browser."""
+        self._config["http_fast_path"] = value
+        self.save_toml()
+
+    @property
+    def html_parser(self) -> str:
+        """Get BeautifulSoup backend ('lxml' or 'html.parser'); None picks lxml when installed."""
+        return self._config["html_parser"] if self._config.get("html_parser", "") != "" else None
+
+    @html_parser.setter
+    def html_parser(self, value):
+        """Set and save BeautifulSoup backend."""
+        self._config["html_parser"] = value
+        self.save_toml()
+
+    @property
+    def failover(self) -> bool:
+        """Get whether failed chapters are looked up on the other websites; default is False."""
+        return (self._config["failover"]
+                if self._config.get("failover", "") != ""
+                else False)
+
+    @failover.setter
+    def failover(self, value):
+        """Set and save whether failed chapters are looked up on the other websites."""
+        self._config["failover"] = value
+        self.save_toml()
+
+    @property
+    def race_sources(self) -> bool:
+        """Get whether page lists are requested from two websites at once; default is False."""
+        return (self._config["race_sources"]
+                if self._config.get("race_sources", "") != ""
+                else False)
+
+    @race_sources.setter
+    def race_sources(self, value):
+        """Set and save whether page lists are requested from two websites at once."""
+        self._config["race_sources"] = value
+        self.save_toml()
+
+    @property
+    def image_workers(self) -> int:
+        """Get number of image processing workers; default is the CPU count."""
+        return (int(self._config["image_workers"])
+                if self._config.get("image_workers", "") != ""
+                else os.cpu_count() or 1)
+
+    @image_workers.setter
+    def image_workers(self, value):
+        """Set and save number of image processing workers."""
+        self._config["image_workers"] = value
+        self.save_toml()
+
+    @property
+    def image_pool(self) -> str:
+        """Get image processing pool kind ('process' or 'thread'); default is 'process'."""
+        return self._config["image_pool"] if self._config.get("image_pool", "") != "" else "process"
+
+    @image_pool.setter
+    def image_pool(self, value):
+        """Set and save image processing pool kind."""
+        self._config["image_pool"] = value
+        self.save_toml()
+
+    @property
+    def cache_size_mb(self) -> int:
+        """Get max size of the raw image cache in MB (0 disables it); default is 2048."""
+        return (int(self._config["cache_size_mb"])
+                if self._config.get("cache_size_mb", "") != ""
+                else 2048)
+
+    @cache_size_mb.setter
+    def cache_size_mb(self, value):
+        """Set and save max size of the raw image cache."""
+        self._config["cache_size_mb"] = value
+        self.save_toml()
+
+    @property
+    def metadata_ttl_hours(self) -> float:
+        """Get hours scraped search results and chapter lists stay cached (0 disables it); default is 12."""
+        return (float(self._config["metadata_ttl_hours"])
+                if self._config.get("metadata_ttl_hours", "") != ""
+                else 12)
+
+    @metadata_ttl_hours.setter
+    def metadata_ttl_hours(self, value):
+        """Set and save hours scraped metadata stays cached."""
+        self._config["metadata_ttl_hours"] = value
+        self.save_toml()
+
+    @property
+    def output_format(self) -> str:
+        """Get codec used for processed pages ('png', 'jpeg' or 'webp'); default is 'png'."""
+        return (self._config["output_format"]
+                if self._config.get("output_format", "") != ""
+                else "png")
+
+    @output_format.setter
+    def output_format(self, value):
+        """Set and save codec used for processed pages."""
+        self._config["output_format"] = value
+        self.save_toml()
+
+    @property
+    def output_quality(self) -> int:
+        """Get JPEG/WebP quality (1-100); default is 85."""
+        return (int(self._config["output_quality"])
+                if self._config.get("output_quality", "") != ""
+                else 85)
+
+    @output_quality.setter
+    def output_quality(self, value):
+        """Set and save JPEG/WebP quality."""
+        self._config["output_quality"] = value
+        self.save_toml()
+
+    @property
+    def png_compress_level(self) -> int:
+        """Get PNG compression level (0 fastest - 9 smallest); default is 6."""
+        return (int(self._config["png_compress_level"])
+                if self._config.get("png_compress_level", "") != ""
+                else 6)
+
+    @png_compress_level.setter
+    def png_compress_level(self, value):
+        """Set and save PNG compression level."""
+        self._config["png_compress_level"] = value
+        self.save_toml()
+
+    @property
+    def webp_method(self) -> int:
+        """Get WebP encoder effort (0 fastest - 6 smallest); default is 4."""
+        return (int(self._config["webp_method"])
+                if self._config.get("webp_method", "") != ""
+                else 4)
+
+    @webp_method.setter
+    def webp_method(self, value):
+        """Set and save WebP encoder effort."""
+        self._config["webp_method"] = value
+        self.save_toml()
+
     @property
     def width(self) -> int:
         """Get image width; None if unset."""
@@ -102,4 +367,18 @@ class Config:
     def height(self, value):
         """Set and save image height."""
         self._config["height"] = value
-        self.save_toml()
\ No newline at end of file
+        self.save_toml()
+
+    @property
+    def image_settings(self) -> dict:
+        """Return the page processing settings as keyword arguments for process_image."""
+        return {
+            "color": self.color,
+            "cropping_mode": self.cropping_mode,
+            "width": self.width,
+            "height": self.height,
+            "output_format": self.output_format,
+            "quality": self.output_quality,
+            "png_compress_level": self.png_compress_level,
+            "webp_method": self.webp_method,
+        }
@@ -1,16 +1,27 @@
 """Downloader for manga chapters using a scraping interface and optional image processing."""
 
 import asyncio
-import os
-from io import BytesIO
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 import ssl
+import time
 
 import aiohttp
 
 from ..scraping import ScraperInterface, MangaError
-from ..utils import Logger
-from .image_converter import ImageConverter
+from ..utils import Logger, CBZWriter
+from .image_converter import process_image, needs_processing, source_extension
 from .config import Config
+from .image_cache import ImageCache
+from .concurrency import AdaptiveLimit, is_overload
+from .rate_limiter import HostRateLimiter, backoff_delay, parse_retry_after
+from .paths import CACHE_PATH
+
+
+# Attempts per page before the chapter is kept for the next run
+PAGE_ATTEMPTS = 5
+# Client errors worth retrying, any other 4xx will fail again
+RETRYABLE_4XX = (408, 425, 429)
 
 
 class MangaDownloader:
@@ -27,74 +38,237 @@ class MangaDownloader:
             self.ssl_context.check_hostname = False
             self.ssl_context.verify_mode = ssl.CERT_NONE
 
-    async def download_chap(self, chapter_url: str, path: str) -> bool:
-        """Download a chapter from URL and save images to the specified path."""
+        # Cap the chapters downloading and the image requests in flight
+        # across every chapter; adaptive mode moves them under these ceilings
+        adaptive = self.config.adaptive_concurrency
+        self.chapter_limit = AdaptiveLimit("chapters", self.config.multiple_tasks, adaptive, window=4)
+        self.request_limit = AdaptiveLimit("requests", self.config.max_requests, adaptive)
+        # Keeps every image host under its request rate, shared by all chapters
+        self.rate_limiter = HostRateLimiter(self.config.host_rate_limit)
+
+        # Shared by every chapter, created on first use inside the event loop
+        self.session: aiohttp.ClientSession = None
+
+        # Raw bytes of every page fetched, opened on first use
+        self.cache: ImageCache = None
+
+        # Image processing runs off the event loop, created on first use
+        self.executor: Executor = None
+        self.image_settings = self.config.image_settings
+        # Pages are stored untouched when no transform applies
+        self.pass_through = not needs_processing(
+            self.config.color, self.config.cropping_mode,
+            self.config.width, self.config.height
+        )
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP client, creating it on first use."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=self.ssl_context,
+                limit=self.config.max_requests,
+                limit_per_host=self.config.connections_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+            self._logger.info("HTTP client session created")
+        return self.session
+
+    def __get_cache(self) -> ImageCache:
+        """Return the raw image cache, opening it on first use; None if disabled."""
+        if self.cache is None and self.config.cache_size_mb > 0:
+            self.cache = ImageCache(CACHE_PATH, self.config.cache_size_mb * 1024 * 1024)
+        return self.cache
+
+    def get_executor(self) -> Executor:
+        """Return the image processing pool, creating it on first use."""
+        if self.executor is None:
+            workers = self.config.image_workers
+            if self.config.image_pool == "thread":
+                self.executor = ThreadPoolExecutor(max_workers=workers)
+            else:
+                self.executor = ProcessPoolExecutor(max_workers=workers)
+            self._logger.info(
+                f"Image {self.config.image_pool} pool created with {workers} workers"
+            )
+        return self.executor
+
+    async def close(self):
+        """Close the pooled HTTP client and the image processing pool."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+            self._logger.info("HTTP client session closed")
+        self.session = None
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self._logger.info("Image processing pool shut down")
+        self.executor = None
+
+        if self.cache is not None:
+            self.cache.close()
+            self._logger.info("Image cache closed")
+        self.cache = None
+
+    async def resolve_chap(self, chapter_url: str, scraper: ScraperInterface = None) -> dict:
+        """Return the image URLs of a chapter as {image_name: URL}, raising MangaError if unusable.
+
+        The chapter is scraped with ``scraper``, the downloader's own one by default.
+        """
+        img_dict = await (scraper or self.scraper).obtain_chapter_content(chapter_url)
+
+        if not img_dict:
+            self._logger.error(f"No images found for chapter at {chapter_url}")
+            raise MangaError(f"Chapter not found at {chapter_url}")
+
+        for img_name, url in img_dict.items():
+            if url.strip() == "" or url == "N/A":
+                self._logger.error(f"Invalid URL for image {img_name}")
+                raise MangaError(f"Invalid URL for image {img_name}")
+        return img_dict
+
+    async def download_chap(
+        self, chapter_url: str, cbz: CBZWriter, img_dict: dict = None, source: str = None
+    ) -> bool:
+        """Download a chapter from URL and stream its pages into the CBZ writer.
+
+        ``img_dict`` is the output of ``resolve_chap`` when the chapter was
+        resolved beforehand, otherwise it is resolved here. ``source`` is the
+        website the pages come from, recorded so a resumed chapter is never
+        completed with pages of another website.
+        Pages are fetched concurrently, up to ``page_tasks`` per chapter and
+        ``max_requests`` across every chapter being downloaded. Pages already
+        stored by a previous run are skipped. Returns True once every page
+        of the chapter is in the archive.
+        """
         try:
-            img_dict = await self.scraper.obtain_chapter_content(chapter_url)
-
-            if not img_dict:
-                self._logger.error(f"No images found for chapter at {chapter_url}")
-                raise MangaError(f"Chapter not found at {chapter_url}")
-
-            async with aiohttp.ClientSession() as session:
-                for img_name, url in img_dict.items():
-                    if url.strip() == "" or url == "N/A":
-                        self._logger.error(f"Invalid URL for image {img_name}")
-                        raise MangaError(f"Invalid URL for image {img_name}")
-
-                    for _ in range(5):
-                        try:
-                            async with session.get(
-                                url,
-                                ssl=self.ssl_context,
-                                timeout=aiohttp.ClientTimeout(total=5),
-                            ) as r:
-                                content = await r.read()
-                                buffer = BytesIO(content)
-                                img = self.__process_image(buffer)
-                                img_path = os.path.normpath(f"{path}/{img_name}.png")
-                                with open(img_path, "wb") as f:
-                                    f.write(img.getvalue())
-                                    self._logger.info(f"Downloaded: {img_path}")
-                                break
-                        except asyncio.TimeoutError:
-                            self._logger.error(f"Timeout while downloading {img_name}")
-                        except FileNotFoundError:
-                            self._logger.error("Download interrupted by user")
-                        except Exception:
-                            self._logger.error("Image download failed probably by antibot")
-                    else:
-                        self._logger.error(f"Failed after 5 retries: {img_name}")
-                        return False
+            if img_dict is None:
+                img_dict = await self.resolve_chap(chapter_url)
+
+            completed = cbz.resume(len(img_dict), source)
+
+            # Zero padded so readers sorting by name keep the page order
+            digits = max(2, len(str(len(img_dict))))
+            page_sem = asyncio.Semaphore(self.config.page_tasks)
+            session = self.__get_session()
+            self.__get_cache()
+            missing = len(img_dict) - len(completed)
+            # Timeouts, 429 and 5xx met by the pages, the chapter limit's signal
+            overloads = []
+            async with self.chapter_limit:
+                start = time.monotonic()
+                results = await asyncio.gather(
+                    *(
+                        self.__download_page(
+                            session, page_sem, cbz, index,
+                            f"Page {index + 1:0{digits}d}", img_name, url, overloads
+                        )
+                        for index, (img_name, url) in enumerate(img_dict.items())
+                        if index not in completed
+                    )
+                )
+            if missing:
+                # Per page, chapters differ in length
+                self.chapter_limit.record(not overloads, (time.monotonic() - start) / missing)
+
+            if not all(results):
+                return False
 
-            self._logger.info(f"Chapter downloaded: {chapter_url} at {path}")
+            self._logger.info(f"Chapter downloaded: {chapter_url} at {cbz.pages_path}")
             return True
 
         except aiohttp.ClientError as e:
             self._logger.error(f"Client error during download: {e}")
             return False
 
-    def __process_image(self, image_buffer):
-        """Apply grayscale, cropping, and resizing to a downloaded image."""
-        width = self.config.width
-        height = self.config.height
-        imgc = ImageConverter(image_buffer)
-        try:
-            if not self.config.color:
-                imgc.grayscale()
-                self._logger.info(f"Grayscale applied: {image_buffer}")
+    async def __download_page(
+        self, session, page_sem, cbz, index, page_stem, img_name, url, overloads: list
+    ) -> bool:
+        """Fetch and process a single page, then hand it to the CBZ writer.
 
-            if self.config.cropping_mode:
-                is_grayscale = not self.config.color
-                imgc.crop_countors(img_is_grayscale=is_grayscale)
-                self._logger.info(f"Cropped: {image_buffer}")
+        Retries up to ``PAGE_ATTEMPTS`` times with exponential backoff and
+        jitter. A 429 or 503 pauses the whole host for its Retry-After (or the
+        backoff delay) instead, other 4xx answers are not retried. Errors
+        meaning the host is overloaded are appended to ``overloads``. The
+        writer puts pages back in reading order regardless of which one
+        finishes first.
+        """
+        async with page_sem:
+            delay = 0
+            for attempt in range(PAGE_ATTEMPTS):
+                await asyncio.sleep(delay)
+                # Backoff before the next attempt, unless the host pause already waits
+                delay = backoff_delay(attempt)
+                try:
+                    content = await self.cache.get(url) if self.cache else None
+                    from_cache = content is not None
+                    if not from_cache:
+                        content = await self.__fetch(session, url)
+                    img, ext = await self.__process_image(content)
+                    # Only images that decoded fine are worth keeping
+                    if self.cache and not from_cache:
+                        await self.cache.put(url, content)
+                    arcname = f"{page_stem}.{ext}"
+                    cbz.add(index, arcname, img)
+                    self._logger.info(f"Downloaded: {img_name} as {arcname}")
+                    return True
+                except aiohttp.ClientResponseError as e:
+                    if is_overload(e):
+                        overloads.append(e)
+                    if e.status in (429, 503):
+                        retry_after = parse_retry_after((e.headers or {}).get("Retry-After"))
+                        self.rate_limiter.pause(url, retry_after if retry_after is not None else delay)
+                        delay = 0
+                        self._logger.warning(f"{img_name}: rate limited ({e.status})")
+                    elif 400 <= e.status < 500 and e.status not in RETRYABLE_4XX:
+                        self._logger.error(f"{img_name}: HTTP {e.status}, not retrying")
+                        return False
+                    else:
+                        self._logger.error(f"{img_name}: HTTP {e.status}")
+                except asyncio.TimeoutError as e:
+                    overloads.append(e)
+                    self._logger.error(f"Timeout while downloading {img_name}")
+                except FileNotFoundError:
+                    self._logger.error("Download interrupted by user")
+                except Exception:
+                    self._logger.error("Image download failed probably by antibot")
 
-            if width is not None and height is not None:
-                imgc.resize(width=width, height=height)
-                self._logger.info(f"Resized: {image_buffer}")
+            self._logger.error(f"Failed after {PAGE_ATTEMPTS} attempts: {img_name}")
+            return False
 
-            return imgc.retrieve_buffered_img()
+    async def __fetch(self, session, url) -> bytes:
+        """GET an image under the request limit and the host rate, raising on error statuses."""
+        # A paused host must not hold request slots other hosts could use
+        await self.rate_limiter.wait_resume(url)
+        async with self.request_limit:
+            # Taken once the request can start, so waiting for a slot spends no token
+            await self.rate_limiter.acquire(url)
+            start = time.monotonic()
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as r:
+                    r.raise_for_status()
+                    content = await r.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.request_limit.record(not is_overload(e), time.monotonic() - start)
+                raise
+        self.request_limit.record(True, time.monotonic() - start)
+        return content
 
+    async def __process_image(self, content: bytes) -> tuple:
+        """Apply grayscale, cropping, and resizing to a downloaded image in the worker pool.
+
+        Returns the encoded page and its file extension.
+        """
+        if self.pass_through:
+            return content, source_extension(content)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.get_executor(),
+                partial(process_image, content, **self.image_settings),
+            )
         except Exception as e:
-            self._logger.error(f"Processing failed for {image_buffer}: {e}")
-            raise
\ No newline at end of file
+            self._logger.error(f"Processing failed: {e}")
+            raise
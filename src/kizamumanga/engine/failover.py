@@ -0,0 +1,150 @@
+"""Source failover: finding the chapters being installed on the other supported websites."""
+
+import asyncio
+import re
+
+from ..scraping import MangaError
+from ..utils import Logger
+
+logger = Logger("engine.failover")
+
+
+# "Chapter 10.5", "Ch. 10", "Capitulo: 10", "Cap 10"...
+CHAPTER_TOKEN = re.compile(r"\b(?:chapter|chap|ch|cap[ií]tulo|cap)\b\.?\s*:?\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def chapter_number(name: str):
+    """Return the chapter number in ``name`` (10 for "Vol 2 Ch 10"), None if it can't tell.
+
+    The number after the chapter token is used; a name without the token
+    only counts when it holds a single number.
+    """
+    match = CHAPTER_TOKEN.search(name)
+    if match:
+        return float(match.group(1))
+    numbers = NUMBER.findall(name)
+    return float(numbers[0]) if len(numbers) == 1 else None
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase ``title`` and drop everything but letters and digits."""
+    return re.sub(r"[^a-z0-9]", "", title.lower())
+
+
+class SourceFailover:
+    """Maps the chapters of a manga onto the other supported websites.
+
+    The first time a website is needed, the manga is searched there by
+    title and its chapter list is indexed by chapter number. Chapters are
+    then resolved on the first website, in ``websites`` order, that has them.
+    """
+
+    def __init__(self, manga_name: str, websites: list, get_scraper, resolve, cached):
+        """Set up the failover for ``manga_name`` across ``websites``.
+
+        ``get_scraper(website)`` returns the scraper of a website,
+        ``resolve(url, scraper)`` returns the page URLs of a chapter and
+        ``cached(kind, key, fetch, website)`` goes through the metadata cache.
+        """
+        self.manga_name = manga_name
+        self.websites = websites
+        self.get_scraper = get_scraper
+        self.resolve = resolve
+        self.cached = cached
+        # One indexing task per website, shared by every chapter looking it up
+        self._indexes = {}
+
+    async def chapters(self, website: str) -> dict:
+        """Return {chapter number: URL} of the manga on ``website``, empty if it isn't there."""
+        if website not in self._indexes:
+            self._indexes[website] = asyncio.ensure_future(self.__index(website))
+        # A cancelled race must not throw away the index other chapters wait for
+        return await asyncio.shield(self._indexes[website])
+
+    async def resolve_elsewhere(self, chap: str, exclude: str = None) -> tuple:
+        """Resolve chapter ``chap`` on the first other website that has it.
+
+        Returns (website, chapter URL, {image_name: URL}); raises MangaError
+        if no website could provide it.
+        """
+        number = chapter_number(chap)
+        if number is None:
+            raise MangaError(f"No chapter number in '{chap}' to look it up elsewhere")
+
+        for website in self.websites:
+            if website == exclude:
+                continue
+            url = (await self.chapters(website)).get(number)
+            if url is None:
+                continue
+            scraper = self.get_scraper(website)
+            try:
+                img_dict = await self.cached(
+                    "pages", url, lambda u: self.resolve(u, scraper), website
+                )
+            except MangaError as e:
+                logger.warning(f"Chapter {chap} failed on {website} too: {e}")
+                continue
+            logger.info(f"Chapter {chap} resolved on {website}")
+            return website, url, img_dict
+        raise MangaError(f"Chapter {chap} not available on any other source")
+
+    async def race(self, primary, chap: str) -> tuple:
+        """Run the ``primary`` coroutine against another website, return whichever succeeds first.
+
+        ``primary`` must return the same (website, URL, img_dict) tuple as
+        ``resolve_elsewhere``. The slower request is cancelled.
+        """
+        tasks = [asyncio.ensure_future(primary), asyncio.ensure_future(self.resolve_elsewhere(chap))]
+        error = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except MangaError as e:
+                    error = e
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __index(self, website: str) -> dict:
+        """Search the manga on ``website`` and index its chapters by number."""
+        scraper = self.get_scraper(website)
+        try:
+            mangas = await self.cached(
+                "search", self.manga_name, scraper.get_mangas_by_title, website
+            )
+            href = self.__best_match(mangas or {})
+            if href is None:
+                logger.info(f"{self.manga_name} not found on {website}")
+                return {}
+            chapters = await self.cached(
+                "chapters", href, scraper.get_chapters_by_mangaurl, website
+            )
+        except MangaError as e:
+            logger.warning(f"{website} unavailable for failover: {e}")
+            return {}
+
+        index = {}
+        for name, url in (chapters or {}).items():
+            number = chapter_number(name)
+            if number is not None:
+                index.setdefault(number, url)
+        logger.info(f"{website}: {len(index)} chapters of {self.manga_name} available")
+        return index
+
+    def __best_match(self, mangas: dict):
+        """Return the URL of the result with the same title, None if none has it.
+
+        Only exact matches (ignoring case, spaces and punctuation) count, a
+        similar title is often another series, e.g. a sequel or a spin-off.
+        """
+        wanted = normalize_title(self.manga_name)
+        for name, href in mangas.items():
+            if normalize_title(name) == wanted:
+                return href
+        if mangas:
+            logger.info(f"No exact title match for {self.manga_name} among {list(mangas)}")
+        return None
@@ -0,0 +1,128 @@
+"""On-disk cache of raw page images, content-addressed and bounded by an LRU size cap."""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+
+from ..utils import Logger
+
+
+class ImageCache:
+    """Stores the raw bytes downloaded for each image URL.
+
+    Blobs are named after the SHA-256 of their content, so the same image
+    served from several URLs is stored once. A SQLite index maps URLs to
+    blobs and tracks when each blob was last used; once the cache grows
+    past ``max_bytes`` the least recently used blobs are evicted.
+    """
+
+    def __init__(self, path, max_bytes: int):
+        """Open (or create) the cache under ``path``."""
+        self.logger = Logger("engine.image_cache")
+        self.path = path
+        self.blobs_path = os.path.join(path, "blobs")
+        self.max_bytes = max_bytes
+        os.makedirs(self.blobs_path, exist_ok=True)
+
+        self.db = sqlite3.connect(os.path.join(path, "images.sqlite"))
+        # Losing the last few writes on a crash only costs a refetch
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, digest TEXT NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS blobs "
+            "(digest TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.commit()
+        self.size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        self.logger.info(f"Image cache opened at {path} ({self.size} bytes)")
+
+    async def get(self, url: str):
+        """Return the cached bytes for ``url``, or None on a miss."""
+        row = self.db.execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        digest = row[0]
+
+        try:
+            content = await asyncio.to_thread(self.__read_blob, digest)
+        except OSError:
+            content = None
+        if content is None or hashlib.sha256(content).hexdigest() != digest:
+            self.logger.warning(f"Dropping missing or corrupt cache entry for {url}")
+            self.__delete_blobs([digest])
+            return None
+
+        self.db.execute("UPDATE blobs SET last_used = ? WHERE digest = ?", (time.time(), digest))
+        self.db.commit()
+        return content
+
+    async def put(self, url: str, content: bytes):
+        """Store ``content`` as the raw bytes of ``url`` and evict if over the cap."""
+        digest = hashlib.sha256(content).hexdigest()
+        exists = self.db.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if exists is None:
+            await asyncio.to_thread(self.__write_blob, digest, content)
+            # Another page with the same content may have been stored meanwhile
+            inserted = self.db.execute(
+                "INSERT OR IGNORE INTO blobs (digest, size, last_used) VALUES (?, ?, ?)",
+                (digest, len(content), time.time()),
+            ).rowcount
+            if inserted:
+                self.size += len(content)
+        self.db.execute("INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)", (url, digest))
+        self.db.commit()
+
+        if self.size > self.max_bytes:
+            self.__evict()
+
+    def close(self):
+        """Close the index database."""
+        self.db.close()
+
+    def __evict(self):
+        """Drop least recently used blobs until the cache is under 90% of its cap."""
+        target = self.max_bytes * 0.9
+        evicted = []
+        size = self.size
+        for digest, blob_size in self.db.execute("SELECT digest, size FROM blobs ORDER BY last_used"):
+            if size <= target:
+                break
+            evicted.append(digest)
+            size -= blob_size
+        self.__delete_blobs(evicted)
+        self.logger.info(f"Evicted {len(evicted)} images, cache size {self.size} bytes")
+
+    def __delete_blobs(self, digests):
+        """Remove blobs from disk and the index, along with the URLs pointing at them."""
+        for digest in digests:
+            row = self.db.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if row is not None:
+                self.size -= row[0]
+            self.db.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            self.db.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+            try:
+                os.remove(self.__blob_path(digest))
+            except FileNotFoundError:
+                pass
+        self.db.commit()
+
+    def __blob_path(self, digest: str) -> str:
+        return os.path.join(self.blobs_path, digest[:2], digest)
+
+    def __read_blob(self, digest: str) -> bytes:
+        with open(self.__blob_path(digest), "rb") as f:
+            return f.read()
+
+    def __write_blob(self, digest: str, content: bytes):
+        path = self.__blob_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique name, the same image can be written by two pages at once
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as f:
+            f.write(content)
+        os.replace(f.name, path)
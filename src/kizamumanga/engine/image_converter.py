@@ -1,97 +1,126 @@
-"""ImageConverter provides image transformations such as grayscale, crop, and resize."""
+"""Page image transformations (grayscale, crop, resize) and encoding for the downloader."""
 from io import BytesIO
 import numpy as np
-import cv2
 from PIL import Image
 
 from ..utils import Logger
 
-
-class ImageConverter:
-    """Applies image transformations including resize, grayscale, and content-aware crop."""
-
-    def __init__(self, img_buffer):
-        """Initialize with a path to the image to be processed."""
-        self.logger = Logger("engine.image_converter")
-        self.b_img = Image.open(img_buffer)
-        self.output_buffer = BytesIO()
-
-    def resize(self, width, height):
-        """Resize the image while preserving aspect ratio."""
-        try:
-            img = self.b_img
-            img_ratio = img.width / img.height
-            target_ratio = width / height
-
-            if img_ratio > target_ratio:
-                height = round(width / img_ratio)
-            else:
-                width = round(height * img_ratio)
-
-            if width <= 0 or height <= 0:
-                raise ValueError(
-                    f"there was an error processing the image. Width:{width}, Height:{height}")
-            
-            self.b_img = img.resize((width, height), resample=Image.Resampling.LANCZOS)
-
-        except OSError as e:
-            self.logger.exception(f"Resize failed for {self.b_img}: {e}")
-            raise RuntimeError from e
-
-    def grayscale(self):
-        """Convert the image to grayscale and overwrite the original."""
-        try:
-            img = np.array(self.b_img)
-        except OSError as e:
-            self.logger.exception(f"Resize failed for {self.b_img}: {e}")
-            raise RuntimeError from e
-        
-        if img is None:
-            self.logger.error("Image could not be loaded for grayscale conversion")
-            raise ValueError("Image could not be loaded for grayscale conversion")
-
-        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-        self.b_img = Image.fromarray(gray)
-
-    def crop_countors(self, padding=10, img_is_grayscale=False):
-        """Crop margins by detecting contours in the image content."""
-        try:
-            image = np.array(self.b_img)
-
-            if image is None:
-                self.logger.error("Image could not be loaded for cropping")
-                return
-
-            if img_is_grayscale:
-                grey = image.copy()
-            else:
-                grey = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-
-            _, thresh = cv2.threshold(grey, 250, 255, cv2.THRESH_BINARY_INV)
-            contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            if not contours:
-                self.logger.warning(f"No contours found")
-                return
-
-            x_min, y_min, x_max, y_max = image.shape[1], image.shape[0], 0, 0
-            for cnt in contours:
-                x, y, w, h = cv2.boundingRect(cnt)
-                x_min = min(x_min, x)
-                y_min = min(y_min, y)
-                x_max = max(x_max, x + w)
-                y_max = max(y_max, y + h)
-
-            x_min = max(x_min - padding, 0)
-            y_min = max(y_min - padding, 0)
-            x_max = min(x_max + padding, image.shape[1])
-            y_max = min(y_max + padding, image.shape[0])
-
-            cropped = image[y_min:y_max, x_min:x_max]
-            self.b_img = Image.fromarray(cropped)
-        except Exception as e:
-            self.logger.error(f"Cropping failed: {e}")
-
-    def retrieve_buffered_img(self):
-        self.b_img.save(self.output_buffer, format="PNG")
-        return self.output_buffer
+logger = Logger("engine.image_converter")
+
+# Output codec name -> (PIL format, file extension)
+OUTPUT_FORMATS = {
+    "png": ("PNG", "png"),
+    "jpeg": ("JPEG", "jpg"),
+    "webp": ("WEBP", "webp"),
+}
+
+SOURCE_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif", "BMP": "bmp"}
+
+
+def fit_size(src_width, src_height, width, height) -> tuple:
+    """Return the largest size fitting in width x height that keeps the aspect ratio."""
+    img_ratio = src_width / src_height
+    target_ratio = width / height
+
+    if img_ratio > target_ratio:
+        height = round(width / img_ratio)
+    else:
+        width = round(height * img_ratio)
+
+    if width <= 0 or height <= 0:
+        raise ValueError(
+            f"there was an error processing the image. Width:{width}, Height:{height}")
+    return width, height
+
+
+def content_box(grey, padding=10, threshold=250):
+    """Return the padded (left, top, right, bottom) box of pixels <= threshold, or None.
+
+    Uses row/column minima of the grayscale array, which is what
+    THRESH_BINARY_INV at ``threshold`` followed by contour detection keeps.
+    """
+    rows = np.flatnonzero(grey.min(axis=1) <= threshold)
+    if rows.size == 0:
+        return None
+    y_min, y_max = rows[0], rows[-1] + 1
+
+    cols = np.flatnonzero(grey[y_min:y_max].min(axis=0) <= threshold)
+    x_min, x_max = cols[0], cols[-1] + 1
+
+    x_min = max(x_min - padding, 0)
+    y_min = max(y_min - padding, 0)
+    x_max = min(x_max + padding, grey.shape[1])
+    y_max = min(y_max + padding, grey.shape[0])
+    return int(x_min), int(y_min), int(x_max), int(y_max)
+
+
+def encode_image(img, buffer, output_format="png", quality=85, png_compress_level=6, webp_method=4):
+    """Encode ``img`` into ``buffer`` with the selected codec."""
+    pil_format, _ = OUTPUT_FORMATS[output_format]
+    if pil_format == "PNG":
+        img.save(buffer, format="PNG", compress_level=png_compress_level)
+    elif pil_format == "JPEG":
+        # JPEG has no alpha or palette support
+        if img.mode not in ("L", "RGB"):
+            img = img.convert("RGB")
+        img.save(buffer, format="JPEG", quality=quality)
+    else:
+        img.save(buffer, format="WEBP", quality=quality, method=webp_method)
+
+
+def needs_processing(color=True, cropping_mode=False, width=None, height=None) -> bool:
+    """Return True when any transform applies and the page has to be re-encoded."""
+    return not color or cropping_mode or (width is not None and height is not None)
+
+
+def source_extension(content: bytes) -> str:
+    """Return the file extension matching the encoded image, read from its header."""
+    with Image.open(BytesIO(content)) as img:
+        return SOURCE_EXTENSIONS.get(img.format, img.format.lower())
+
+
+def process_image(content: bytes, color=True, cropping_mode=False, width=None, height=None,
+                  output_format="png", quality=85, png_compress_level=6, webp_method=4) -> tuple:
+    """Apply grayscale, cropping, and resizing to raw image bytes and re-encode them.
+
+    Fused version of the old chain of ``ImageConverter`` calls (kept in
+    ``benchmarks/legacy_converter.py``): the page is decoded once
+    (straight to grayscale for JPEGs when color is off), the margins are found
+    on a single array, and crop and resize happen in one resampling pass
+    before the only encode.
+
+    Runs inside the downloader worker pool, so it only takes and returns picklable
+    values. Returns the encoded page and its file extension.
+    """
+    if not needs_processing(color, cropping_mode, width, height):
+        return content, source_extension(content)
+
+    img = Image.open(BytesIO(content))
+    if not color:
+        if img.format == "JPEG":
+            # libjpeg outputs luma directly, no RGB bitmap is ever built
+            img.draft("L", None)
+        if img.mode != "L":
+            img = img.convert("L")
+        logger.info("Grayscale applied")
+
+    box = None
+    if cropping_mode:
+        grey = np.asarray(img if img.mode == "L" else img.convert("L"))
+        box = content_box(grey)
+        if box is None:
+            logger.warning("No content found")
+        else:
+            logger.info("Cropped")
+
+    if width is not None and height is not None:
+        left, top, right, bottom = box or (0, 0, img.width, img.height)
+        size = fit_size(right - left, bottom - top, width, height)
+        img = img.resize(size, resample=Image.Resampling.LANCZOS, box=box)
+        logger.info("Resized")
+    elif box is not None:
+        img = img.crop(box)
+
+    buffer = BytesIO()
+    encode_image(img, buffer, output_format, quality, png_compress_level, webp_method)
+    return buffer.getvalue(), OUTPUT_FORMATS[output_format][1]
@@ -0,0 +1,66 @@
+"""Local cache of scraped metadata: search results, chapter lists and page URLs."""
+
+import json
+import os
+import sqlite3
+import time
+
+from ..utils import Logger
+
+
+class MetadataCache:
+    """Keeps the dicts returned by the scrapers for ``ttl`` seconds.
+
+    Entries are keyed by website, kind ("search", "chapters" or "pages")
+    and the title or URL they were scraped for, and stored as JSON in a
+    SQLite database so they survive between runs.
+    """
+
+    def __init__(self, path, ttl: float):
+        """Open (or create) the cache under ``path`` and drop expired entries."""
+        self.logger = Logger("engine.metadata_cache")
+        self.ttl = ttl
+        os.makedirs(path, exist_ok=True)
+
+        self.db = sqlite3.connect(os.path.join(path, "metadata.sqlite"))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "website TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL, "
+            "value TEXT NOT NULL, stored_at REAL NOT NULL, "
+            "PRIMARY KEY (website, kind, key))"
+        )
+        self.db.execute("DELETE FROM entries WHERE stored_at < ?", (time.time() - ttl,))
+        self.db.commit()
+        self.logger.info(f"Metadata cache opened at {path}")
+
+    def get(self, website: str, kind: str, key: str):
+        """Return the cached dict, or None if missing or expired."""
+        row = self.db.execute(
+            "SELECT value, stored_at FROM entries WHERE website = ? AND kind = ? AND key = ?",
+            (website, kind, key),
+        ).fetchone()
+        if row is None or row[1] < time.time() - self.ttl:
+            return None
+        self.logger.info(f"Cache hit for {kind} '{key}' on {website}")
+        return json.loads(row[0])
+
+    def put(self, website: str, kind: str, key: str, value: dict):
+        """Store ``value``, replacing any previous entry."""
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries (website, kind, key, value, stored_at) VALUES (?, ?, ?, ?, ?)",
+            (website, kind, key, json.dumps(value), time.time()),
+        )
+        self.db.commit()
+
+    def invalidate(self, website: str, kind: str, key: str):
+        """Drop an entry, e.g. page URLs that stopped working."""
+        self.db.execute(
+            "DELETE FROM entries WHERE website = ? AND kind = ? AND key = ?",
+            (website, kind, key),
+        )
+        self.db.commit()
+
+    def close(self):
+        """Close the database."""
+        self.db.close()
@@ -12,4 +12,5 @@ with open(CONFIG_PATH, "r", encoding="utf-8") as f:
     config = tomlkit.parse(f.read())
 
 CBZ_PATH = config["cbz_path"] if config["cbz_path"] != "" else pathlib.Path.home() / "Documents" / "manga_downloads"
-TEMP_PATH = os.path.join(CBZ_PATH, ".kizamumanga")
\ No newline at end of file
+TEMP_PATH = os.path.join(CBZ_PATH, ".kizamumanga")
+CACHE_PATH = os.path.join(CBZ_PATH, ".kizamumanga_cache")
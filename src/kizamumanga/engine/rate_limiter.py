@@ -0,0 +1,90 @@
+"""Per-host request rate limiting and retry delays for the image downloads."""
+
+import asyncio
+from email.utils import parsedate_to_datetime
+import random
+import time
+from urllib.parse import urlsplit
+
+from ..utils import Logger
+
+# Longest Retry-After honoured, a longer one would stall the whole run
+MAX_RETRY_AFTER = 120
+
+
+def parse_retry_after(value: str):
+    """Return the seconds asked by a Retry-After header (delay or HTTP date), None if unusable."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for retry number ``attempt`` (0 based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class HostRateLimiter:
+    """Token bucket per host, shared by every download.
+
+    Each host refills ``rate`` tokens per second up to ``burst``; a request
+    waits for a token of its host. A host that answered 429 or 503 can be
+    paused, holding every request to it until the pause ends. A ``rate`` of
+    0 disables the limiting, pauses still apply.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        """Create empty buckets, each host gets its own on first use."""
+        self.logger = Logger("engine.rate_limiter")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        # host -> [tokens, last refill, paused until]
+        self._buckets = {}
+
+    async def acquire(self, url: str):
+        """Wait until a request to the host of ``url`` is allowed."""
+        bucket = self.__bucket(url)
+        while True:
+            now = time.monotonic()
+            if now < bucket[2]:
+                await asyncio.sleep(bucket[2] - now)
+                continue
+            if self.rate <= 0:
+                return
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return
+            await asyncio.sleep((1 - bucket[0]) / self.rate)
+
+    async def wait_resume(self, url: str):
+        """Wait until a pause of the host of ``url``, if any, is over."""
+        bucket = self.__bucket(url)
+        while (left := bucket[2] - time.monotonic()) > 0:
+            await asyncio.sleep(left)
+
+    def pause(self, url: str, seconds: float):
+        """Hold every request to the host of ``url`` for ``seconds``."""
+        bucket = self.__bucket(url)
+        until = time.monotonic() + seconds
+        if until > bucket[2]:
+            bucket[2] = until
+            # Start over from an empty bucket once the pause ends
+            bucket[0] = 0
+            bucket[1] = until
+            self.logger.warning(f"{urlsplit(url).netloc}: requests paused for {seconds:.1f} s")
+
+    def __bucket(self, url: str) -> list:
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = [self.burst, time.monotonic(), 0.0]
+        return self._buckets[host]
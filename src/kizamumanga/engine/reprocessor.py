@@ -0,0 +1,51 @@
+"""Offline re-processing of existing CBZ archives for a new device profile."""
+
+import os
+from zipfile import ZipFile
+
+from .image_converter import process_image
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp")
+
+
+def find_archives(root: str) -> list:
+    """Return every .cbz under ``root``, skipping hidden work and cache folders."""
+    archives = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for file in sorted(files):
+            if file.lower().endswith(".cbz"):
+                archives.append(os.path.join(current, file))
+    return archives
+
+
+def reprocess_cbz(path: str, settings: dict) -> int:
+    """Run every page of the archive at ``path`` through ``process_image``.
+
+    Members are read and written one at a time, so memory stays bounded by
+    the largest page. The new archive is written next to the original and
+    swapped in with ``os.replace``, leaving the original untouched on error.
+    Runs inside a worker pool; returns the number of pages processed.
+    """
+    tmp_path = f"{path}.tmp"
+    pages = 0
+    try:
+        with ZipFile(path) as src, ZipFile(tmp_path, "w") as dst:
+            for info in sorted(src.infolist(), key=lambda i: i.filename):
+                if info.is_dir():
+                    continue
+                data = src.read(info)
+                stem, ext = os.path.splitext(info.filename)
+                if ext.lower() not in IMAGE_EXTENSIONS:
+                    dst.writestr(info, data)
+                    continue
+
+                img, new_ext = process_image(data, **settings)
+                dst.writestr(f"{stem}.{new_ext}", img)
+                pages += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return pages
@@ -3,18 +3,24 @@ KizamuManga - Engine runner module for managing manga downloads."""
 
 import asyncio
 import os
-import shutil
 import socket
-import tempfile
 import time
 
 from rich.console import Console
+from rich.markup import escape
 from ..handlers import ArgsHandler
-from ..scraping import WeebCentral, InManga, LeerMangaEsp, ScraperInterface, MangaError
-from ..utils import LoadingSpinner, export_to_cbz, Ascii, Logger
+from ..scraping import (
+    WeebCentral, InManga, LeerMangaEsp, ScraperInterface, ScraperBase, BrowserLauncher, MangaError
+)
+from ..utils import LoadingSpinner, CBZWriter, Ascii, Logger
 from .downloader import MangaDownloader
+from .image_converter import needs_processing
+from .reprocessor import find_archives, reprocess_cbz
+from .metadata_cache import MetadataCache
+from .failover import SourceFailover
+from .scheduler import Scheduler
 from .config import Config
-from .paths import CBZ_PATH, TEMP_PATH
+from .paths import CBZ_PATH, TEMP_PATH, CACHE_PATH
 
 
 class Runner:
@@ -39,10 +45,17 @@ class Runner:
 
         # retrieve the selected scrapper
         self.ws: ScraperInterface = None
+        self.website: str = None
+        # Every scraper created, all sharing one browser
+        self.scrapers: dict = {}
+        self.launcher: BrowserLauncher = None
 
         # Initialize
         self.mdownloader: MangaDownloader = None
-        self.sem: asyncio.Semaphore = None
+        # Scraped metadata kept between runs, opened on first use
+        self.metadata: MetadataCache = None
+        # Other websites to take failing chapters from, set up on install
+        self.failover: SourceFailover = None
         self.ls: LoadingSpinner = None
         self.manga_name = None
 
@@ -50,14 +63,9 @@ class Runner:
             self.__set_up()
 
     def __set_up(self):
-        self.ws: ScraperInterface = None
-        match self.config.website:  # retrieve the selected scrapper
-            case "weeb_central":
-                self.ws = WeebCentral()
-            case "inmanga":
-                self.ws = InManga()
-            case "leermangaesp":
-                self.ws = LeerMangaEsp()
+        self.launcher = BrowserLauncher()
+        self.website = self.config.website
+        self.ws: ScraperInterface = self.__get_scraper(self.website)
         self.logger.info(
             f"Scraper initialized and selected: {self.ws.__class__.__name__}"
         )
@@ -65,9 +73,8 @@ class Runner:
         self.mdownloader = MangaDownloader(self.ws)
         self.logger.info("MangaDownloader initialized")
 
-        self.sem = asyncio.Semaphore(self.config.multiple_tasks)
         self.logger.info(
-            f"Semaphore initialized with {self.config.multiple_tasks} tasks"
+            f"Pipeline set to {self.config.resolve_tasks} resolve and {self.config.multiple_tasks} download tasks"
         )
         self.ls = LoadingSpinner()
         self.logger.info("LoadingSpinner initialized")
@@ -82,20 +89,18 @@ class Runner:
             
             print(f"Mangas path: {self.config.cbz_path}")
             
-            # Create tempPath
-            os.makedirs(TEMP_PATH, exist_ok=True)
-            self.logger.info(f"Temporary PNGs path created: {TEMP_PATH}")
-                    
             # Check if cbz_path exists
             if not os.path.exists(CBZ_PATH):
                 print("Please set a valid folder for the cbz_path")
                 raise FileNotFoundError(
                     f"Folder doesn't exists at: {CBZ_PATH}")
 
-            # set up scraper components
-            await self.ws.set_up()
-            self.logger.info("Scraper set up completed")
+            # Offline command, no scraper needed
+            if self.args.command == "reprocess":
+                await self.reprocess()
+                return
 
+            # The scraper launches its browser on the first lookup that needs it
             if self.args.command == "search" or self.args.command == "install":
                 chapters = await self.search()
                 self.logger.info("Chapters retrieved")
@@ -156,6 +161,78 @@ class Runner:
                     print(
                         f"Multiple tasks changed to {self.args.multiple_tasks}"
                     )
+                if self.args.page_tasks:
+                    self.config.page_tasks = self.args.page_tasks
+                    self.logger.info(
+                        f"Page tasks changed to {self.args.page_tasks}"
+                    )
+                    print(f"Page tasks changed to {self.args.page_tasks}")
+                if self.args.max_requests:
+                    self.config.max_requests = self.args.max_requests
+                    self.logger.info(
+                        f"Max requests changed to {self.args.max_requests}"
+                    )
+                    print(f"Max requests changed to {self.args.max_requests}")
+                if self.args.resolve_tasks:
+                    self.config.resolve_tasks = self.args.resolve_tasks
+                    self.logger.info(
+                        f"Resolve tasks changed to {self.args.resolve_tasks}"
+                    )
+                    print(f"Resolve tasks changed to {self.args.resolve_tasks}")
+                if self.args.download_order:
+                    self.config.download_order = self.args.download_order
+                    self.logger.info(
+                        f"Download order changed to {self.args.download_order}"
+                    )
+                    print(f"Download order changed to {self.args.download_order}")
+                if self.args.browser_contexts:
+                    self.config.browser_contexts = self.args.browser_contexts
+                    self.logger.info(
+                        f"Browser contexts changed to {self.args.browser_contexts}"
+                    )
+                    print(f"Browser contexts changed to {self.args.browser_contexts}")
+                if self.args.host_rate_limit is not None:
+                    self.config.host_rate_limit = self.args.host_rate_limit
+                    self.logger.info(
+                        f"Host rate limit changed to {self.args.host_rate_limit}"
+                    )
+                    print(f"Host rate limit changed to {self.args.host_rate_limit}")
+                if self.args.adaptive_concurrency is not None:
+                    self.config.adaptive_concurrency = self.args.adaptive_concurrency == "true"
+                    self.logger.info(
+                        f"Adaptive concurrency changed to {self.args.adaptive_concurrency}"
+                    )
+                    print(f"Adaptive concurrency changed to {self.args.adaptive_concurrency}")
+                if self.args.search_timeout:
+                    self.config.search_timeout = self.args.search_timeout
+                    self.logger.info(
+                        f"Search timeout changed to {self.args.search_timeout}"
+                    )
+                    print(f"Search timeout changed to {self.args.search_timeout}")
+                if self.args.http_fast_path is not None:
+                    self.config.http_fast_path = self.args.http_fast_path == "true"
+                    self.logger.info(
+                        f"HTTP fast path changed to {self.args.http_fast_path}"
+                    )
+                    print(f"HTTP fast path changed to {self.args.http_fast_path}")
+                if self.args.html_parser:
+                    self.config.html_parser = self.args.html_parser
+                    self.logger.info(
+                        f"HTML parser changed to {self.args.html_parser}"
+                    )
+                    print(f"HTML parser changed to {self.args.html_parser}")
+                if self.args.failover is not None:
+                    self.config.failover = self.args.failover == "true"
+                    self.logger.info(
+                        f"Failover changed to {self.args.failover}"
+                    )
+                    print(f"Failover changed to {self.args.failover}")
+                if self.args.race_sources is not None:
+                    self.config.race_sources = self.args.race_sources == "true"
+                    self.logger.info(
+                        f"Race sources changed to {self.args.race_sources}"
+                    )
+                    print(f"Race sources changed to {self.args.race_sources}")
             elif self.args.conf_comm == "output":
                 if self.args.cropping_mode is not None:  # it's bool
                     self.config.cropping_mode = self.args.cropping_mode
@@ -169,6 +246,31 @@ class Runner:
                     self.config.color = self.args.color
                     self.logger.info(f"Color changed to {self.args.website}")
                     print(f"Color changed to {self.args.website}")
+                if self.args.output_format:
+                    self.config.output_format = self.args.output_format
+                    self.logger.info(
+                        f"Output format changed to {self.args.output_format}"
+                    )
+                    print(f"Output format changed to {self.args.output_format}")
+                if self.args.output_quality:
+                    self.config.output_quality = self.args.output_quality
+                    self.logger.info(
+                        f"Output quality changed to {self.args.output_quality}"
+                    )
+                    print(f"Output quality changed to {self.args.output_quality}")
+                # 0 is a valid level, so only None means unset
+                if self.args.png_compress_level is not None:
+                    self.config.png_compress_level = self.args.png_compress_level
+                    self.logger.info(
+                        f"PNG compression level changed to {self.args.png_compress_level}"
+                    )
+                    print(f"PNG compression level changed to {self.args.png_compress_level}")
+                if self.args.webp_method is not None:
+                    self.config.webp_method = self.args.webp_method
+                    self.logger.info(
+                        f"WebP method changed to {self.args.webp_method}"
+                    )
+                    print(f"WebP method changed to {self.args.webp_method}")
             elif self.args.conf_comm == "paths":
                 if self.args.cbz_path:
                     self.config.cbz_path = self.args.cbz_path
@@ -176,18 +278,34 @@ class Runner:
                         f"CBZ path changed to {self.args.cbz_path}")
                     print(
                         f"CBZ path changed to {self.args.cbz_path}")
+                if self.args.cache_size_mb is not None:
+                    self.config.cache_size_mb = self.args.cache_size_mb
+                    self.logger.info(
+                        f"Cache size changed to {self.args.cache_size_mb} MB")
+                    print(
+                        f"Cache size changed to {self.args.cache_size_mb} MB")
+                if self.args.metadata_ttl_hours is not None:
+                    self.config.metadata_ttl_hours = self.args.metadata_ttl_hours
+                    self.logger.info(
+                        f"Metadata cache TTL changed to {self.args.metadata_ttl_hours} hours")
+                    print(
+                        f"Metadata cache TTL changed to {self.args.metadata_ttl_hours} hours")
 
     async def search(self) -> dict:
         """Method to search for mangas and retrieve chapters."""
         manga_name = self.args.name
-        self.ls.start("Retrieving mangas")
-        mangas_retrieved = await self.ws.get_mangas_by_title(manga_name)
-        self.logger.info(f"Mangas retrieved: {len(mangas_retrieved)}")
-        self.ls.end()
+        if self.args.all_sources:
+            mangas_retrieved = await self.__search_all_sources(manga_name)
+        else:
+            self.ls.start("Retrieving mangas")
+            mangas_retrieved = await self.__cached(
+                "search", manga_name, self.ws.get_mangas_by_title)
+            self.logger.info(f"Mangas retrieved: {len(mangas_retrieved)}")
+            self.ls.end()
 
-        self.console.print("[bold white]AVAILABLE MANGAS:[/bold white]")
-        for i, key in enumerate(mangas_retrieved.keys(), start=0):
-            self.console.print(f"[white]{i}[/white] - {key}")
+            self.console.print("[bold white]AVAILABLE MANGAS:[/bold white]")
+            for i, key in enumerate(mangas_retrieved.keys(), start=0):
+                self.console.print(f"[white]{i}[/white] - {key}")
 
         try:
             # User selects the manga
@@ -205,9 +323,15 @@ class Runner:
                 self.logger.info(
                     f"Selected manga: {self.manga_name} with href: {href}")
                 break
+        if self.args.all_sources:
+            # Continue with the source the manga was found on
+            website, href = href
+            self.manga_name = self.manga_name.removeprefix(f"[{website}] ")
+            self.__use_source(website)
         # Retrieve all the chapters
         self.ls.start("Retrieving chapters")
-        chapters = await self.ws.get_chapters_by_mangaurl(href)
+        chapters = await self.__cached(
+            "chapters", href, self.ws.get_chapters_by_mangaurl)
         self.ls.end()
         self.logger.info(f"Chapters retrieved: {len(chapters)}")
 
@@ -264,27 +388,27 @@ class Runner:
         manga_name = await self.__replace_invalid_chars(self.manga_name)
 
         download_all = True if self.args.chap is None else False
-        tasks = []
+        jobs = []
 
         manga_path = os.path.normpath(f"{CBZ_PATH}/{manga_name}")
         os.makedirs(manga_path, exist_ok=True)
 
+        if self.config.failover or self.config.race_sources:
+            alternatives = [
+                w for w in ScraperBase.get_available_websites() if w != self.website
+            ]
+            self.failover = SourceFailover(
+                self.manga_name, alternatives, self.__get_scraper,
+                self.mdownloader.resolve_chap, self.__cached,
+            )
+            self.logger.info(f"Failover enabled on {alternatives}")
+
         if download_all is True:
             self.ls.start("Downloading all chapters", len(chapters))
             self.logger.info("Downloading all chapters")
             for chap, href in chapters.items():
                 chap = await self.__replace_invalid_chars(chap)
-                pngs_path = os.path.normpath(
-                    f"{TEMP_PATH}/{manga_name}/{chap}")
-                tasks.append(
-                    self.__download_chap(
-                        pngs_path=pngs_path,
-                        manga_path=manga_path,
-                        manga_name=manga_name,
-                        chap=chap,
-                        chap_url=href,
-                    )
-                )
+                jobs.append((chap, href))
         else:
             self.ls.start("Downloading chapters", len(chapters))
             self.logger.info(
@@ -293,37 +417,52 @@ class Runner:
                 # If it's a range of chaps
                 if isinstance(self.args.chap, list):
                     if i >= int(self.args.chap[0]) and i <= int(self.args.chap[1]):
-                        pngs_path = f"{TEMP_PATH}/{manga_name}/{chap}"
-                        tasks.append(
-                            self.__download_chap(
-                                pngs_path=pngs_path,
-                                manga_path=manga_path,
-                                manga_name=manga_name,
-                                chap=chap,
-                                chap_url=href,
-                            )
-                        )
+                        jobs.append((chap, href))
                 # If it's just one chap
                 else:
                     if i == self.args.chap:
-                        pngs_path = f"{TEMP_PATH}/{manga_name}/{chap}"
-                        tasks.append(
-                            self.__download_chap(
-                                pngs_path=pngs_path,
-                                manga_path=manga_path,
-                                manga_name=manga_name,
-                                chap=chap,
-                                chap_url=href,
-                            )
-                        )
-        # Wait for all tasks to be completed
-        await asyncio.gather(*tasks)
+                        jobs.append((chap, href))
+        # Wait for all chapters to go through the pipeline
+        await self.__pipeline(manga_path, manga_name, jobs)
         self.logger.info(f"All tasks completed for {manga_name}")
 
         time.sleep(1)
         Ascii().thank_you_for_downloading()
         print(f"Chapters downloaded at {manga_path}")
 
+    async def reprocess(self):
+        """Method to re-process downloaded CBZ archives with the current image settings."""
+        root = CBZ_PATH
+        if self.args.name:
+            root = os.path.normpath(
+                f"{CBZ_PATH}/{await self.__replace_invalid_chars(self.args.name)}")
+            if not os.path.exists(root):
+                print(f"Manga folder not found: {root}")
+                raise FileNotFoundError(f"Folder doesn't exists at: {root}")
+
+        settings = self.config.image_settings
+        if not needs_processing(
+            settings["color"], settings["cropping_mode"], settings["width"], settings["height"]
+        ):
+            print("Nothing to reprocess: color is on, cropping is off and no dimensions are set")
+            return
+
+        archives = find_archives(root)
+        if not archives:
+            print(f"No CBZ files found at {root}")
+            return
+        self.logger.info(f"Reprocessing {len(archives)} archives under {root}")
+
+        executor = self.mdownloader.get_executor()
+        self.ls.start("Reprocessing chapters", len(archives))
+        results = await asyncio.gather(
+            *(self.__reprocess_archive(executor, path, settings) for path in archives)
+        )
+        self.ls.end()
+
+        failed = results.count(False)
+        print(f"Reprocessed {len(archives) - failed}/{len(archives)} chapters at {root}")
+
     async def close(self):
         """Method to close the runner and clean up resources."""
         try:
@@ -333,14 +472,29 @@ class Runner:
                     self.ls.end()
                     self.logger.info("LoadingSpinner ended")
 
-            # ------------------ Deleting temp_path----------------------
+            # ------------------ Cleaning temp_path----------------------
+            # Unfinished chapters are kept so the next run can resume them
             if os.path.exists(TEMP_PATH):
-                shutil.rmtree(TEMP_PATH)
-                self.logger.info(f"Temporary PNGs path {TEMP_PATH} removed")
+                for root, _, _ in os.walk(TEMP_PATH, topdown=False):
+                    if not os.listdir(root):
+                        os.rmdir(root)
+                self.logger.info(f"Empty folders in temporary path {TEMP_PATH} removed")
+
+            # -------------------Closing HTTP client-----------------
+            if self.mdownloader is not None:
+                await asyncio.shield(self.mdownloader.close())
+                self.logger.info("Downloader closed")
+
+            if self.metadata is not None:
+                self.metadata.close()
+                self.logger.info("Metadata cache closed")
 
             # -------------------Closing WebScraping-----------------
-            await asyncio.shield(self.ws.close())
-            self.logger.info("Scraper closed")
+            for scraper in self.scrapers.values():
+                await asyncio.shield(scraper.close())
+            if self.launcher is not None:
+                await asyncio.shield(self.launcher.close())
+            self.logger.info("Scrapers closed")
 
             # --------------------Closing all tasks---------------------
             tasks = [t for t in asyncio.all_tasks(
@@ -361,29 +515,216 @@ class Runner:
         except Exception as e:
             raise KeyboardInterrupt from e
 
-    async def __download_chap(self, pngs_path, manga_path, manga_name, chap, chap_url):
-        filename = f"{manga_name}-{chap}"
-        if not os.path.exists(f"{manga_path}/{filename}.cbz"):
-            async with self.sem:
-                # self.ls.start("Downloading")
-                os.makedirs(pngs_path, exist_ok=True)
-                if await asyncio.shield(
-                    self.mdownloader.download_chap(
-                        path=pngs_path, chapter_url=chap_url)
-                ):
-                    self.logger.info(f"Chapter {chap} downloaded successfully")
-                else:
-                    self.logger.error(f"Failed to download chapter {chap}")
-                # self.ls.end()
-                export_to_cbz(pngs_path, manga_path, filename)
-                self.logger.info(f"Exported chapter {chap} to CBZ format")
-                shutil.rmtree(pngs_path)
-                self.logger.info(f"Temporary PNGs path {pngs_path} removed")
+    def __get_scraper(self, website: str) -> ScraperInterface:
+        """Return the scraper of ``website``, creating it on the shared browser the first time."""
+        if website not in self.scrapers:
+            # One pooled page per chapter being resolved, spread over the contexts
+            settings = dict(
+                pool_size=self.config.resolve_tasks,
+                contexts=self.config.browser_contexts,
+                http_fast_path=self.config.http_fast_path,
+                html_parser=self.config.html_parser,
+                launcher=self.launcher,
+            )
+            match website:  # retrieve the selected scrapper
+                case "weeb_central":
+                    self.scrapers[website] = WeebCentral(**settings)
+                case "inmanga":
+                    self.scrapers[website] = InManga(**settings)
+                case "leermangaesp":
+                    self.scrapers[website] = LeerMangaEsp(**settings)
+        return self.scrapers[website]
+
+    def __use_source(self, website: str):
+        """Switch the runner and the downloader to the scraper of ``website``."""
+        self.website = website
+        self.ws = self.__get_scraper(website)
+        self.mdownloader.scraper = self.ws
+        self.logger.info(f"Scraper selected: {self.ws.__class__.__name__}")
+
+    async def __search_all_sources(self, manga_name) -> dict:
+        """Search every supported website at once, listing each source's results as soon as it answers.
+
+        Returns {"[website] name": (website, URL)}. A source that fails or
+        takes longer than ``search_timeout`` seconds is skipped.
+        """
+        timeout = self.config.search_timeout
+
+        async def search_source(website):
+            scraper = self.__get_scraper(website)
+            try:
+                mangas = await asyncio.wait_for(
+                    self.__cached("search", manga_name, scraper.get_mangas_by_title, website),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Search on {website} timed out after {timeout} s")
+                return website, None
+            except MangaError as e:
+                self.logger.warning(f"Search on {website} failed: {e}")
+                return website, None
+            return website, mangas or {}
+
+        websites = ScraperBase.get_available_websites()
+        print(f"Searching {len(websites)} sources...")
+        self.console.print("[bold white]AVAILABLE MANGAS:[/bold white]")
+        merged = {}
+        for next_done in asyncio.as_completed([search_source(w) for w in websites]):
+            website, mangas = await next_done
+            if mangas is None:
+                self.console.print(f"[dim]{website}: unavailable, skipped[/dim]")
+                continue
+            if not mangas:
+                self.console.print(f"[dim]{website}: nothing found[/dim]")
+                continue
+            for name, href in mangas.items():
+                key = f"[{website}] {name}"
+                self.console.print(f"[white]{len(merged)}[/white] - {escape(key)}")
+                merged[key] = (website, href)
+        self.logger.info(f"Mangas retrieved from all sources: {len(merged)}")
+        return merged
+
+    async def __cached(self, kind, key, fetch, website=None) -> dict:
+        """Return ``fetch(key)`` from the metadata cache, scraping and storing it on a miss.
+
+        Entries are stored under ``website``, the current source by default.
+        ``--no_cache`` skips the lookup but still refreshes the stored entry.
+        """
+        if self.metadata is None and self.config.metadata_ttl_hours > 0:
+            self.metadata = MetadataCache(CACHE_PATH, self.config.metadata_ttl_hours * 3600)
+        if self.metadata is None:
+            return await fetch(key)
+
+        website = website or self.website
+        if not self.args.no_cache:
+            value = self.metadata.get(website, kind, key)
+            if value is not None:
+                return value
+        value = await fetch(key)
+        if value:
+            self.metadata.put(website, kind, key, value)
+        return value
+
+    async def __pipeline(self, manga_path, manga_name, jobs):
+        """Resolve chapters and download their pages in two overlapping stages.
+
+        ``resolve_tasks`` workers scrape the image URLs of the chapters and
+        hand them to ``multiple_tasks`` download workers, so the browser keeps
+        resolving the next chapters while the previous ones are being
+        downloaded. Both stages follow ``download_order``, and chapters left
+        unfinished by a previous run go first.
+        """
+        order = self.config.download_order
+        work_path = os.path.normpath(f"{TEMP_PATH}/{manga_name}")
+
+        async def resolve(job):
+            index, priority, chap, href = job
+            if os.path.exists(f"{manga_path}/{manga_name}-{chap}.cbz"):
+                self.logger.info(f"Chapter {chap} already exists in CBZ format")
                 self.ls.update(chap)
-        else:
-            self.logger.info(f"Chapter {chap} already exists in CBZ format")
+                return
+            try:
+                resolved = await self.__resolve_chap(chap, href)
+            except MangaError as e:
+                self.logger.error(f"Failed to resolve chapter {chap}: {e}")
+                self.ls.update(chap)
+                return
+            await downloads.submit((chap, *resolved), index, priority)
+
+        async def download(job):
+            chap, website, href, img_dict = job
+            done = await self.__download_chap(
+                manga_path, manga_name, chap, website, href, img_dict)
+            if not done and self.failover is not None:
+                try:
+                    website, href, img_dict = await self.failover.resolve_elsewhere(
+                        chap, exclude=website)
+                    await self.__download_chap(
+                        manga_path, manga_name, chap, website, href, img_dict)
+                except MangaError as e:
+                    self.logger.error(f"No failover for chapter {chap}: {e}")
             self.ls.update(chap)
 
+        resolvers = Scheduler("resolve", self.config.resolve_tasks, resolve, order)
+        # Resolvers stay at most one batch of downloads ahead
+        downloads = Scheduler(
+            "download", self.config.multiple_tasks, download, order,
+            maxsize=self.config.multiple_tasks,
+        )
+
+        async def resolve_stage():
+            for index, (chap, href) in enumerate(jobs):
+                # Partial chapters resume first
+                partial = os.path.exists(f"{work_path}/{manga_name}-{chap}.json")
+                await resolvers.submit((index, int(partial), chap, href), index, int(partial))
+            await resolvers.join()
+            downloads.close()
+
+        async with resolvers, downloads:
+            tasks = [asyncio.create_task(resolve_stage()), asyncio.create_task(downloads.wait())]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def __resolve_chap(self, chap, href) -> tuple:
+        """Return (website, chapter URL, img_dict) of a chapter, trying other websites if enabled.
+
+        In race mode the configured website and the first other website with
+        the chapter are asked at once and the first answer wins.
+        """
+        async def primary():
+            img_dict = await self.__cached("pages", href, self.mdownloader.resolve_chap)
+            return self.website, href, img_dict
+
+        if self.failover is None:
+            return await primary()
+        if self.config.race_sources:
+            return await self.failover.race(primary(), chap)
+        try:
+            return await primary()
+        except MangaError as e:
+            self.logger.warning(f"Chapter {chap} failed on {self.website}, trying other sources: {e}")
+            return await self.failover.resolve_elsewhere(chap, exclude=self.website)
+
+    async def __download_chap(self, manga_path, manga_name, chap, website, chap_url, img_dict) -> bool:
+        """Download a resolved chapter into its CBZ, returning True once it is complete."""
+        filename = f"{manga_name}-{chap}"
+        # Pages of unfinished chapters and their manifests live here
+        work_path = os.path.normpath(f"{TEMP_PATH}/{manga_name}")
+        os.makedirs(work_path, exist_ok=True)
+        cbz = CBZWriter(work_path, manga_path, filename)
+        try:
+            # Not shielded: a cancel stops every page task before the checkpoint
+            await self.mdownloader.download_chap(
+                chapter_url=chap_url, cbz=cbz, img_dict=img_dict, source=website)
+        except BaseException:
+            cbz.checkpoint()
+            raise
+        if cbz.close():
+            self.logger.info(f"Chapter {chap} downloaded from {website} and exported to CBZ format")
+            return True
+        self.logger.error(
+            f"Failed to download chapter {chap} from {website}, progress saved to resume on the next run"
+        )
+        # The page URLs may have expired, scrape them again next time
+        if self.metadata is not None:
+            self.metadata.invalidate(website, "pages", chap_url)
+        return False
+
+    async def __reprocess_archive(self, executor, path, settings) -> bool:
+        loop = asyncio.get_running_loop()
+        try:
+            pages = await loop.run_in_executor(executor, reprocess_cbz, path, settings)
+            self.logger.info(f"Reprocessed {pages} pages in {path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to reprocess {path}: {e}")
+            return False
+        finally:
+            self.ls.update(os.path.basename(path))
+
     async def __replace_invalid_chars(self, vtoreplace:str)->str:
         invalid_chars = [
             "<", ">", ":", '"', "/", "\\", "|", "?", "*"]
@@ -0,0 +1,110 @@
+"""Work-queue scheduler: a fixed pool of workers pulling jobs in priority order."""
+
+import asyncio
+import itertools
+
+from ..utils import Logger
+
+ORDERS = ["ascending", "newest_first"]
+
+
+class Scheduler:
+    """Runs jobs through ``handler`` with a fixed number of worker tasks.
+
+    Jobs with a higher priority run first; jobs of equal priority follow
+    their index, lowest first with the "ascending" order and highest first
+    with "newest_first". Only ``workers`` tasks exist whatever the number of
+    jobs, and a ``maxsize`` above zero makes ``submit`` wait for room, so a
+    slow stage holds back the one feeding it.
+
+    Use it as an async context manager: the workers start on entry and any
+    still running are cancelled on exit.
+    """
+
+    def __init__(self, name: str, workers: int, handler, order: str = "ascending", maxsize: int = 0):
+        """Create the queue; ``handler(job)`` is awaited once per submitted job."""
+        if order not in ORDERS:
+            raise ValueError(f"Invalid order '{order}', must be one of {ORDERS}")
+        self.logger = Logger("engine.scheduler")
+        self.name = name
+        self.workers = workers
+        self.handler = handler
+        self.order = order
+        self._queue = asyncio.PriorityQueue()
+        # Bounds the queued jobs, the stop markers never wait for room
+        self._room = asyncio.Semaphore(maxsize) if maxsize > 0 else None
+        # Tie breaker keeping submission order and never comparing the jobs
+        self._counter = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+        self._closed = False
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cancel()
+
+    def start(self):
+        """Start the worker tasks."""
+        self._tasks = [
+            asyncio.create_task(self.__worker(), name=f"{self.name}-{i}")
+            for i in range(self.workers)
+        ]
+        self.logger.info(f"{self.name}: {self.workers} workers started, {self.order} order")
+
+    async def submit(self, job, index: int = 0, priority: int = 0):
+        """Queue ``job``, waiting for room if the queue is full."""
+        if self._closed:
+            raise RuntimeError(f"{self.name}: scheduler closed, no more jobs accepted")
+        position = index if self.order == "ascending" else -index
+        if self._room is not None:
+            await self._room.acquire()
+        self._queue.put_nowait((-priority, position, next(self._counter), job))
+
+    def close(self):
+        """Stop accepting jobs, the workers exit once the queued ones are handled."""
+        if self._closed:
+            return
+        self._closed = True
+        # One stop marker per worker, sorted after every job
+        for _ in self._tasks:
+            self._queue.put_nowait((float("inf"), 0, next(self._counter), None))
+
+    async def wait(self):
+        """Wait for the workers to exit after ``close``.
+
+        An exception raised by a handler cancels the other workers and is
+        raised here.
+        """
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.cancel()
+
+    async def join(self):
+        """Close the scheduler and wait until every queued job has been handled."""
+        self.close()
+        await self.wait()
+
+    async def cancel(self):
+        """Cancel the workers and drop the jobs still queued."""
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        dropped = 0
+        while not self._queue.empty():
+            if self._queue.get_nowait()[-1] is not None:
+                dropped += 1
+        if dropped:
+            self.logger.info(f"{self.name}: {dropped} queued jobs dropped")
+
+    async def __worker(self):
+        while True:
+            *_, job = await self._queue.get()
+            if job is None:
+                return
+            if self._room is not None:
+                self._room.release()
+            await self.handler(job)
@@ -5,11 +5,12 @@ Supports commands for installation, search, and configuration settings (dimensio
 """
 
 import argparse
+import importlib.util
 import os
 import re
 
 from ..utils import Logger
-from ..scraping import ScraperBase
+from ..scraping import ScraperBase, HTML_PARSERS
 
 AVAILABLE_DEVICES = {"boox_go_7":[1680, 1264]}
 
@@ -26,6 +27,7 @@ class ArgsHandler():
         self._config_args()
         self._install_args()
         self._search_args()
+        self._reprocess_args()
         return self.parser.parse_args()
 
     def _install_args(self):
@@ -44,6 +46,16 @@ class ArgsHandler():
             nargs="?",
             help="Chapters to download. Use a number (e.g., 5) or a range (e.g., 9-18)"
         )
+        install.add_argument(
+            "--all_sources",
+            action="store_true",
+            help="Search every supported website and install from the one picked"
+        )
+        install.add_argument(
+            "--no_cache",
+            action="store_true",
+            help="Scrape again instead of using cached search results and chapter lists"
+        )
 
     def _search_args(self):
         """Configure CLI options for searching manga titles."""
@@ -54,6 +66,27 @@ class ArgsHandler():
             "name",
             help="The name of the manga to search (e.g., 'Bleach')"
         )
+        search.add_argument(
+            "--all_sources",
+            action="store_true",
+            help="Search every supported website at once"
+        )
+        search.add_argument(
+            "--no_cache",
+            action="store_true",
+            help="Scrape again instead of using cached search results and chapter lists"
+        )
+
+    def _reprocess_args(self):
+        """Configure CLI options for re-processing already downloaded chapters."""
+        reprocess = self.subparsers.add_parser(
+            "reprocess", help="Re-apply the current image settings to downloaded CBZ files"
+        )
+        reprocess.add_argument(
+            "name",
+            nargs="?",
+            help="Manga folder inside cbz_path to reprocess (default: the whole library)"
+        )
 
     def _config_args(self):
         """Configure CLI options for modifying configuration settings (e.g., dimensions, paths)"""
@@ -93,6 +126,16 @@ class ArgsHandler():
             "--cbz_path",
             help="Directory path where CBZ files will be stored",
         )
+        conf_paths.add_argument(
+            "--cache_size_mb",
+            type=int,
+            help="Size cap of the raw image cache in MB (0 disables it)",
+        )
+        conf_paths.add_argument(
+            "--metadata_ttl_hours",
+            type=float,
+            help="Hours scraped search results and chapter lists stay cached (0 disables it)",
+        )
 
         # ---------------SCRAPER----------------------
         scraper = conf_parser.add_parser(
@@ -107,6 +150,66 @@ class ArgsHandler():
             type=int,
             help="Number of parallel download tasks (e.g., 5)"
         )
+        scraper.add_argument(
+            "--resolve_tasks",
+            type=int,
+            help="Number of chapters whose image URLs are scraped at the same time (e.g., 2)"
+        )
+        scraper.add_argument(
+            "--download_order",
+            choices=["ascending", "newest_first"],
+            help="Order chapters are downloaded in"
+        )
+        scraper.add_argument(
+            "--browser_contexts",
+            type=int,
+            help="Number of browser contexts the chapters being scraped are spread over (e.g., 2)"
+        )
+        scraper.add_argument(
+            "--page_tasks",
+            type=int,
+            help="Number of pages fetched at the same time inside each chapter (e.g., 4)"
+        )
+        scraper.add_argument(
+            "--max_requests",
+            type=int,
+            help="Maximum number of image requests in flight across all chapters (e.g., 16)"
+        )
+        scraper.add_argument(
+            "--host_rate_limit",
+            type=float,
+            help="Image requests per second sent to each host, 0 for no limit (e.g., 10)"
+        )
+        scraper.add_argument(
+            "--adaptive_concurrency",
+            choices=["true", "false"],
+            help="Adapt chapter and request concurrency to the sites, up to multiple_tasks and max_requests"
+        )
+        scraper.add_argument(
+            "--search_timeout",
+            type=float,
+            help="Seconds each website has to answer a search with --all_sources (e.g., 30)"
+        )
+        scraper.add_argument(
+            "--http_fast_path",
+            choices=["true", "false"],
+            help="Try plain HTTP requests before launching the browser"
+        )
+        scraper.add_argument(
+            "--html_parser",
+            choices=HTML_PARSERS,
+            help="BeautifulSoup backend used to read the scraped pages (lxml is faster)"
+        )
+        scraper.add_argument(
+            "--failover",
+            choices=["true", "false"],
+            help="Take chapters that fail on the website from the other supported websites"
+        )
+        scraper.add_argument(
+            "--race_sources",
+            choices=["true", "false"],
+            help="Request page lists from two websites at once and keep the fastest"
+        )
 
         # ---------------OUTPUT----------------------
         output_img = conf_parser.add_parser(
@@ -122,6 +225,30 @@ class ArgsHandler():
             choices=["true", "false"],
             help="Enable automatic margin cropping for cleaner images"
         )
+        output_img.add_argument(
+            "--format",
+            dest="output_format",
+            choices=["png", "jpeg", "webp"],
+            help="Codec used for processed pages"
+        )
+        output_img.add_argument(
+            "--quality",
+            dest="output_quality",
+            type=int,
+            help="Quality used by the jpeg and webp codecs (1-100)"
+        )
+        output_img.add_argument(
+            "--png_compress_level",
+            dest="png_compress_level",
+            type=int,
+            help="PNG compression level (0 fastest - 9 smallest)"
+        )
+        output_img.add_argument(
+            "--webp_method",
+            dest="webp_method",
+            type=int,
+            help="WebP encoder effort (0 fastest - 6 smallest)"
+        )
         
 
     def validate_args(self):
@@ -171,6 +298,14 @@ class ArgsHandler():
                         else:
                             error = "You need to especify the width and height"
                             
+                elif self.args.conf_comm == "output":
+                    if self.args.output_quality is not None and not 1 <= self.args.output_quality <= 100:
+                        error = "Invalid --quality: must be between 1 and 100"
+                    elif self.args.png_compress_level is not None and not 0 <= self.args.png_compress_level <= 9:
+                        error = "Invalid --png_compress_level: must be between 0 and 9"
+                    elif self.args.webp_method is not None and not 0 <= self.args.webp_method <= 6:
+                        error = "Invalid --webp_method: must be between 0 and 6"
+
                 elif self.args.conf_comm == "paths":
                     if self.args.cbz_path:
                         new_path = os.path.abspath(self.args.cbz_path)
@@ -184,6 +319,12 @@ class ArgsHandler():
                             else:
                                 error = "No valid answer at specifying to create new path"
                         self.args.cbz_path = new_path
+
+                    if self.args.cache_size_mb is not None and self.args.cache_size_mb < 0:
+                        error = "Invalid --cache_size_mb: must be zero or a positive integer"
+
+                    if self.args.metadata_ttl_hours is not None and self.args.metadata_ttl_hours < 0:
+                        error = "Invalid --metadata_ttl_hours: must be zero or a positive number"
                             
                 elif self.args.conf_comm == "scraper":
                     if self.args.website and not ScraperBase.is_available(self.args.website):
@@ -194,6 +335,27 @@ class ArgsHandler():
                             self.parser.error(
                             "Invalid --multiple_tasks: must be a positive integer greater than zero"
                             )
+
+                    if self.args.html_parser == "lxml" and importlib.util.find_spec("lxml") is None:
+                        error = "Invalid --html_parser: lxml is not installed (pip install lxml)"
+
+                    if self.args.host_rate_limit is not None and self.args.host_rate_limit < 0:
+                        error = "Invalid --host_rate_limit: must be zero or a positive number"
+
+                    if self.args.search_timeout is not None and self.args.search_timeout <= 0:
+                        error = "Invalid --search_timeout: must be a positive number"
+
+                    if self.args.resolve_tasks is not None and self.args.resolve_tasks <= 0:
+                        error = "Invalid --resolve_tasks: must be a positive integer greater than zero"
+
+                    if self.args.browser_contexts is not None and self.args.browser_contexts <= 0:
+                        error = "Invalid --browser_contexts: must be a positive integer greater than zero"
+
+                    if self.args.page_tasks is not None and self.args.page_tasks <= 0:
+                        error = "Invalid --page_tasks: must be a positive integer greater than zero"
+
+                    if self.args.max_requests is not None and self.args.max_requests <= 0:
+                        error = "Invalid --max_requests: must be a positive integer greater than zero"
         if error:
             self.logger.error(error)
             self.parser.error(error)
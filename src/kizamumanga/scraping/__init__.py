@@ -2,4 +2,4 @@ from .weeb_central import WeebCentral
 from .inmanga import InManga
 from .leermangaesp import LeerMangaEsp
 from .interface import ScraperInterface
-from .base import ScraperBase, MangaError
\ No newline at end of file
+from .base import ScraperBase, BrowserLauncher, MangaError, make_soup, HTML_PARSERS
\ No newline at end of file
@@ -1,54 +1,315 @@
 """Base Scraper class for managing Playwright browser sessions and common validations."""
 
 import asyncio
+import re
+from contextlib import asynccontextmanager
 
-from playwright.async_api import async_playwright
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
+from playwright.async_api import (
+    async_playwright, Browser, BrowserContext, Page, Route, TimeoutError as PlaywrightTimeoutError
+)
 
 from ..utils import Logger
 
 
 AVAILABLE_WBSITES = ["weeb_central", "inmanga", "leermangaesp"]
 
+HTML_PARSERS = ["lxml", "html.parser"]
+try:
+    # Optional, several times faster than the bundled html.parser
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+# True once the selector matches and its count held for ``quiet`` ms
+STABLE_COUNT_JS = """([selector, quiet]) => {
+    const n = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const seen = (window.__kizamuStable ||= {});
+    if (!seen[selector] || seen[selector].n !== n) {
+        seen[selector] = {n, since: now};
+        return false;
+    }
+    return n > 0 && now - seen[selector].since >= quiet;
+}"""
+
 
 class MangaError(Exception):
     """Custom exception for manga-related errors."""
 
 
+def make_soup(html: str, parser: str = None, parse_only=None) -> BeautifulSoup:
+    """Parse ``html`` with ``parser``, lxml when installed by default.
+
+    ``parse_only`` is a SoupStrainer limiting the tree to the tags the
+    scraper reads, which skips building the rest of the page.
+    """
+    return BeautifulSoup(html, parser or DEFAULT_PARSER, parse_only=parse_only)
+
+
+def class_strainer(name: str, tag: str = None) -> SoupStrainer:
+    """SoupStrainer keeping the ``tag`` elements that have the CSS class ``name``."""
+    return SoupStrainer(tag, class_=re.compile(rf"(^|\s){re.escape(name)}(\s|$)"))
+
+
+class BrowserLauncher:
+    """Headless Chromium launched on first use, shareable by several scrapers.
+
+    Each scraper opens its own context in the shared browser, so sources
+    keep their own headers, routes and cookies.
+    """
+
+    def __init__(self):
+        """Initialize the logger and the browser placeholders."""
+        self.logger = Logger("scraping.browser_launcher")
+        self.playwright = None
+        self.browser: Browser = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Browser:
+        """Return the browser, starting Playwright and launching it on the first call."""
+        async with self._lock:
+            if self.browser is None:
+                self.logger.info("Setting up Playwright browser")
+                self.playwright = await async_playwright().start()
+                self.logger.info("Launching headless browser")
+                self.browser = await self.playwright.chromium.launch(headless=True)
+            return self.browser
+
+    async def close(self):
+        """Safely close the browser and stop Playwright with timeouts."""
+        # Close browser if initialized
+        if self.browser:
+            try:
+                await asyncio.wait_for(self.browser.close(), timeout=1)
+                self.logger.info("Browser closed successfully")
+            except Exception as e:
+                self.logger.exception(f"Error closing browser: {type(e).__name__}: {e}")
+
+        # Stop Playwright if it was ever started
+        if self.playwright:
+            try:
+                await asyncio.wait_for(self.playwright.stop(), timeout=1)
+                self.logger.info("Playwright stopped successfully")
+            except Exception as e:
+                self.logger.exception(f"Error stopping Playwright: {type(e).__name__}: {e}")
+        self.browser = None
+        self.playwright = None
+
+
+class ContextSlot:
+    """A browser context of a scraper with its idle pages and the pages lent out."""
+
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.idle_pages: list[Page] = []
+        self.active = 0
+
+
 class ScraperBase:
     """Base class for manga scrapers using Playwright."""
 
-    def __init__(self):
-        """Initialize logger and browser/context placeholders."""
+    # Resource types aborted by the context, extraction only needs the HTML.
+    # Scrapers whose pages rely on some of them override this.
+    blocked_resources = ("image", "media", "font", "stylesheet")
+
+    def __init__(
+        self, pool_size: int = 5, http_fast_path: bool = True, html_parser: str = None,
+        launcher: BrowserLauncher = None, contexts: int = 1,
+    ):
+        """Initialize logger, browser/context placeholders and the page pool.
+
+        ``pool_size`` bounds how many pages can be open at once, it should
+        match the number of tasks using the scraper concurrently. The pages
+        are spread over ``contexts`` browser contexts (at most one per page),
+        so concurrent tasks don't share cookies, cache and renderer.
+        ``http_fast_path`` lets scrapers try a plain HTTP request before
+        falling back to the browser. ``html_parser`` is the BeautifulSoup
+        backend, the fastest one installed if None. ``launcher`` shares a
+        browser with other scrapers; without one the scraper launches and
+        closes its own.
+        """
         self.logger = Logger("scraping.scraper_base")
+        self.launcher = launcher or BrowserLauncher()
+        self._owns_launcher = launcher is None
         self.browser = None
-        self.context = None
+        self.contexts: list[ContextSlot] = []
+        self.context_count = max(1, min(contexts, pool_size))
+        # The browser is launched by the first call that needs a page
+        self._launch_lock = asyncio.Lock()
+        # Extra HTTP headers applied to every pooled page, set by each scraper
+        self.headers = {}
+        self.http_fast_path = http_fast_path
+        self.html_parser = html_parser or DEFAULT_PARSER
+        # Used by the fast path, created on first use inside the event loop
+        self.session: aiohttp.ClientSession = None
+        self.pool_size = pool_size
+        self._page_sem = asyncio.Semaphore(pool_size)
 
     async def set_up(self):
-        """Start Playwright and create a headless browser context."""
-        self.logger.info("Setting up Playwright browser")
-        p = await async_playwright().start()
-        self.logger.info("Launching headless browser")
-        self.browser = await p.chromium.launch(headless=True)
-        self.logger.info("Creating new browser context")
-        self.context = await self.browser.new_context()
+        """Get the browser from the launcher, create the contexts and pre-warm the page pool.
+
+        Called on demand by ``_page``, does nothing if the contexts are already up.
+        """
+        async with self._launch_lock:
+            if self.contexts:
+                return
+            self.browser = await self.launcher.get()
+            self.logger.info(f"Creating {self.context_count} browser contexts")
+            slots = list(
+                await asyncio.gather(*(self.__new_context() for _ in range(self.context_count)))
+            )
+            if self.blocked_resources:
+                self.logger.info(f"Blocking resources: {', '.join(self.blocked_resources)}")
+            # Pages are spread evenly, the first contexts take the remainder
+            for i in range(self.pool_size):
+                slots[i % len(slots)].idle_pages.append(None)
+            for slot in slots:
+                slot.idle_pages = list(
+                    await asyncio.gather(*(self.__new_page(slot) for _ in slot.idle_pages))
+                )
+            self.contexts = slots
+            self.logger.info(
+                f"Page pool pre-warmed with {self.pool_size} pages across {len(slots)} contexts"
+            )
+
+    @asynccontextmanager
+    async def _page(self):
+        """Borrow a page from the pool and give it back once the block ends.
+
+        The page is taken from the least loaded context and comes with the
+        scraper headers already applied. A page that raised is closed instead
+        of returned, so a broken page is never reused.
+        """
+        if not self.contexts:
+            await self.set_up()
+        async with self._page_sem:
+            slot = min(self.contexts, key=lambda s: s.active)
+            slot.active += 1
+            try:
+                page = None
+                while slot.idle_pages and page is None:
+                    page = slot.idle_pages.pop()
+                    if page.is_closed():
+                        page = None
+                if page is None:
+                    page = await self.__new_page(slot)
+
+                try:
+                    yield page
+                except BaseException:
+                    await self.__close_page(page)
+                    raise
+
+                try:
+                    # Drop the previous document so it stops running scripts while idle
+                    await page.goto("about:blank")
+                    slot.idle_pages.append(page)
+                except Exception:
+                    await self.__close_page(page)
+            finally:
+                slot.active -= 1
+
+    async def _fetch_html(self, url: str) -> str:
+        """GET ``url`` without the browser and return the response body."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(headers=self.headers)
+        async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as r:
+            r.raise_for_status()
+            return await r.text()
+
+    async def _try_http(self, operation: str, url: str, parse):
+        """Fetch ``url`` over plain HTTP and return ``parse(html, html_parser)``.
+
+        Returns None when the fast path is disabled, the request fails, the
+        body can't be decoded or parsed, or nothing could be parsed, so the
+        caller falls back to the browser.
+        """
+        if not self.http_fast_path or url is None:
+            return None
+        try:
+            html = await self._fetch_html(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+            self.logger.warning(f"{operation}: HTTP fast path failed ({type(e).__name__}: {e}), using the browser")
+            return None
+        try:
+            result = parse(html, self.html_parser)
+        except Exception as e:
+            # A page laid out differently than expected, the browser may still read it
+            self.logger.warning(f"{operation}: couldn't parse the HTTP response ({type(e).__name__}: {e}), using the browser")
+            return None
+        if not result:
+            self.logger.info(f"{operation}: nothing found over HTTP, using the browser")
+            return None
+        self.logger.debug(f"{operation}: served over HTTP")
+        return result
+
+    async def _wait_until_stable(self, page: Page, selector: str, timeout: int = 5000, quiet: int = 300):
+        """Wait until ``selector`` matches and the number of matches stops changing.
+
+        Returns as soon as the count held for ``quiet`` ms, and after
+        ``timeout`` ms at most, whatever the page is doing.
+        """
+        try:
+            await page.wait_for_function(
+                STABLE_COUNT_JS, arg=[selector, quiet], timeout=timeout, polling=100
+            )
+        except PlaywrightTimeoutError:
+            self.logger.warning(f"'{selector}' still changing after {timeout} ms, continuing")
+
+    async def _outer_html(self, page: Page, selector: str) -> str:
+        """Serialize only the elements matching ``selector`` instead of the whole document."""
+        return await page.eval_on_selector_all(
+            selector, "els => els.map(e => e.outerHTML).join('')"
+        )
+
+    async def __filter_request(self, route: Route):
+        """Abort requests for resource types the scraper doesn't need."""
+        if route.request.resource_type in self.blocked_resources:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def __new_context(self) -> ContextSlot:
+        """Create a browser context blocking the resources the scraper doesn't need."""
+        context = await self.browser.new_context()
+        if self.blocked_resources:
+            await context.route("**/*", self.__filter_request)
+        return ContextSlot(context)
+
+    async def __new_page(self, slot: ContextSlot) -> Page:
+        """Open a page in the context of ``slot`` with the scraper headers applied."""
+        page = await slot.context.new_page()
+        await page.set_extra_http_headers(self.headers)
+        return page
+
+    async def __close_page(self, page: Page):
+        """Close a page ignoring errors, it may be already closed."""
+        try:
+            await page.close()
+        except Exception:
+            pass
 
     async def close(self):
-        """Safely close the browser context and browser with timeouts."""
-        # Close context if initialized
-        if self.context:
+        """Safely close the HTTP session, browser contexts and owned browser with timeouts."""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        # Close the contexts if initialized
+        for slot in self.contexts:
+            slot.idle_pages.clear()
             try:
-                await asyncio.wait_for(self.context.close(), timeout=1)
-                self.logger.info("Context closed successfully")
+                await asyncio.wait_for(slot.context.close(), timeout=1)
             except Exception as e:
                 self.logger.exception(f"Error closing context: {type(e).__name__}: {e}")
+        if self.contexts:
+            self.logger.info(f"{len(self.contexts)} contexts closed")
+        self.contexts = []
 
-        # Close browser if initialized
-        if self.browser:
-            try:
-                await asyncio.wait_for(self.browser.close(), timeout=1)
-                self.logger.info("Browser closed successfully")
-            except Exception as e:
-                self.logger.exception(f"Error closing browser: {type(e).__name__}: {e}")
+        # The browser is only closed by the scraper that launched it
+        if self._owns_launcher:
+            await self.launcher.close()
 
     @staticmethod
     def is_available(web: str) -> bool:
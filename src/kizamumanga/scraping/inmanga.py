@@ -1,27 +1,111 @@
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from playwright.async_api import Error, TimeoutError as PlaywrightTimeoutError, Page
+from playwright.async_api import Error, TimeoutError as PlaywrightTimeoutError
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..utils import Logger, extract_num
 from .interface import ScraperInterface
-from .base import ScraperBase, MangaError
-
-import time
+from .base import ScraperBase, MangaError, BrowserLauncher, make_soup
 
 BASE_URL = "https://inmanga.com/"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/114.0.0.0 Safari/537.36"
 }
+# Pages show a .gif placeholder until the real image is swapped in
+IMAGES_LOADED_JS = """() => [...document.querySelectorAll("img.ImageContainer")]
+    .every(img => !(img.getAttribute("src") || "").includes(".gif"))"""
+# Swaps in the real URL of the pages whose lazy loader already holds it in a
+# data attribute, returns how many pages are still showing the placeholder
+PROMOTE_LAZY_JS = """() => {
+    let pending = 0;
+    for (const img of document.querySelectorAll("img.ImageContainer")) {
+        if (!(img.getAttribute("src") || "").includes(".gif")) continue;
+        const real = img.dataset.src || img.dataset.original || img.dataset.lazySrc;
+        if (real && !real.includes(".gif")) img.setAttribute("src", real);
+        else pending++;
+    }
+    return pending;
+}"""
+# Scrolls each page still showing the placeholder into view, one frame apart
+SCROLL_PENDING_JS = """async () => {
+    const frame = () => new Promise(r => requestAnimationFrame(() => setTimeout(r, 50)));
+    for (const img of document.querySelectorAll("img.ImageContainer")) {
+        if (!(img.getAttribute("src") || "").includes(".gif")) continue;
+        img.scrollIntoView({block: "center"});
+        await frame();
+    }
+}"""
+# Scroll passes over the pending pages before the attempt is retried
+SCROLL_PASSES = 2
+
+
+def _parse_search(html: str, parser: str = None) -> dict:
+    """Return the search results of ``html`` as {name: URL}."""
+    soup = make_soup(html, parser, SoupStrainer(["a", "img"]))
+    manga_names = soup.select("a.manga-result")
+
+    names = soup.select("img.lazy")
+
+    nl = {}
+    for i,item in enumerate(manga_names, start=0):
+        name = names[i].get("alt", "N/A").replace("Manga Online - InManga", "").strip()
+        nl[name] = f"{BASE_URL}{item.get('href', 'N/A')}"
+    return nl
+
+
+def _parse_chapters(html: str, parser: str = None) -> dict:
+    """Return the chapters of ``html`` as {chapter_name: URL}, sorted by chapter number."""
+    soup = make_soup(html, parser, SoupStrainer("a"))
+
+    chaps = soup.select("a.viewed-chapter")
+
+    # Retrieving mangas
+    nl = {}
+    for chap in chaps:
+        href = chap.get("href")
+        nl[f"Capitulo: {chap.get('data-c-number')}"] = href
+
+    # Sorting the retrieved mangas
+    sorted_nl = {}
+    for chap in sorted(nl, key=extract_num):
+        sorted_nl[chap] = nl[chap]
+
+    return sorted_nl
+
+
+def _parse_pages(html: str, parser: str = None) -> dict:
+    """Return the page images of ``html`` as {image_name: src}."""
+    soup = make_soup(html, parser, SoupStrainer("img"))
+    tags = soup.select("img.ImageContainer")
+
+    chapters_dict = {}
+
+    for i, tag in enumerate(tags, start=1):
+        if tag.has_attr("alt") and "InManga" in tag["alt"]:
+            chapters_dict[f"Pagina {i}"] = tag.get("src", "N/A")
+
+    return chapters_dict
 
 
 class InManga(ScraperBase, ScraperInterface):
-    """Scraper for WeebCentral site to fetch manga info and images."""
+    """Scraper for WeebCentral site to fetch manga info and images.
+
+    Every page of the site is rendered by scripts, so it has no HTTP fast
+    path and always uses the browser.
+    """
 
-    def __init__(self):
+    # The reader lazy loads its images on scroll, it needs the images
+    # and the stylesheets to lay the pages out
+    blocked_resources = ("media", "font")
+
+    def __init__(
+        self, pool_size: int = 5, http_fast_path: bool = True, html_parser: str = None,
+        launcher: BrowserLauncher = None, contexts: int = 1,
+    ):
         """Initialize WeebCentral scraper with logging."""
-        super().__init__()
+        super().__init__(pool_size, http_fast_path, html_parser, launcher, contexts)
+        self.headers = HEADERS
         self.logger = Logger("scraping.inmanga")
 
     @staticmethod
@@ -37,44 +121,25 @@ class InManga(ScraperBase, ScraperInterface):
         retry_error_callback=__retry_state.__func__,
     )
 
-    async def __close_page(self, page: Page):
-        if page:
-            try:
-                await page.close()
-            except Exception:
-                pass
-
     @retry(**_RETRY_KW)
     async def get_mangas_by_title(self, title: str) -> dict:
         """Search manga by title and return matches as {name: URL}."""
-        page = None
         url = f"{BASE_URL}manga/consult"
         try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
-            await page.goto(url, wait_until="domcontentloaded", timeout=3000)
-            time.sleep(2)
-            await page.type("#SearchManga", title, delay=100, timeout=3000)
-            time.sleep(1)
-            try:
-                await page.wait_for_selector("#MangaConsultResult > a:nth-child(2)", timeout=1000)
-            except Error as e:
-                print("Manga not found")
-                return
-            html = await page.content()
+            async with self._page() as page:
+                await page.goto(url, wait_until="domcontentloaded", timeout=3000)
+                await page.wait_for_selector("#SearchManga", state="visible", timeout=3000)
+                await page.type("#SearchManga", title, delay=100, timeout=3000)
+                try:
+                    await page.wait_for_selector("#MangaConsultResult > a:nth-child(2)", timeout=3000)
+                except Error as e:
+                    print("Manga not found")
+                    return
+                html = await page.content()
         except Error as e:
             raise MangaError("Manga not found") from e
-        finally:
-            await self.__close_page(page)
 
-        soup = BeautifulSoup(html, "html.parser")
-        manga_names = soup.select("a.manga-result")
-
-        nl = {}
-        for i,item in enumerate(manga_names, start=0):
-            names = soup.select("img.lazy")
-            name = names[i].get("alt", "N/A").replace("Manga Online - InManga", "").strip()
-            nl[name] = f"{BASE_URL}{item.get("href", "N/A")}"
+        nl = _parse_search(html, self.html_parser)
         if nl is not None:
             print("found")
             return nl
@@ -85,84 +150,37 @@ class InManga(ScraperBase, ScraperInterface):
     @retry(**_RETRY_KW)
     async def get_chapters_by_mangaurl(self, manga_url) -> dict:
         """Return chapters for a manga as {chapter_name: URL}, sorted by chapter number."""
-        page = None
-        try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
+        async with self._page() as page:
             await page.goto(manga_url, wait_until="domcontentloaded")
             await page.wait_for_selector("#ChaptersContainer > a:nth-child(2)", timeout=2000)
-            html = await page.content()
-
-            soup = BeautifulSoup(html, "html.parser")
+            html = await self._outer_html(page, "#ChaptersContainer")
 
-            chaps = soup.select("a.viewed-chapter")
-
-            # Retrieving mangas
-            nl = {}
-            for chap in chaps:
-                href = chap.get("href")
-                nl[f"Capitulo: {chap.get("data-c-number")}"] = href
-
-            # Sorting the retrieved mangas
-            sorted_nl = {}
-            for chap in sorted(nl, key=extract_num):
-                sorted_nl[chap] = nl[chap]
-
-            return sorted_nl
-        finally:
-            await self.__close_page(page)
+        return _parse_chapters(html, self.html_parser)
 
     @retry(**_RETRY_KW)
     async def obtain_chapter_content(self, manga_url) -> dict:
         """Get image URLs for a chapter as {image_name: src}."""
-        page = None
         manga_url = BASE_URL + manga_url
-        try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
-
+        async with self._page() as page:
             await page.goto(manga_url, wait_until="domcontentloaded")
-            await page.wait_for_timeout(2000)
             await page.wait_for_selector("a.NextPage:nth-child(1)")
-            
-            while True:
-                height1 = await page.evaluate("document.scrollingElement.scrollHeight")
-                for i in range(round(height1/200) + 50):
-                    await page.mouse.wheel(0,200)
-                height2 = await page.evaluate("document.scrollingElement.scrollHeight")
-                if height1 == height2:
+
+            # Scroll only to the pages the lazy loader hasn't resolved, a
+            # bounded number of times, instead of wheeling through the reader
+            pending = await page.evaluate(PROMOTE_LAZY_JS)
+            for _ in range(SCROLL_PASSES):
+                if not pending:
                     break
-            i = 0
-            while True:
-                if i != 2:
-                    html = await page.content()
-                    soup = BeautifulSoup(html, "html.parser")
-                    tags = soup.select("img.ImageContainer")
-                    
-                    loaded = True
-                    for tag in tags:
-                        if ".gif" in tag.get("src"):
-                            loaded = False
-                            print("Not charged")
-                            break
-                    if loaded:
-                        break
-                    i += 1
-                    time.sleep(1)
-                else:
-                    print("Couldn't load all imgs")
-                    raise PlaywrightTimeoutError("Page couldn't charge all the images")
-        except PlaywrightTimeoutError:
-            raise
-        finally:
-            await self.__close_page(page)
-      
-
-        chapters_dict = {}
-
-        for i, tag in enumerate(tags, start=1):
-            if tag.has_attr("alt") and "InManga" in tag["alt"]:
-                chapters_dict[f"Pagina {i}"] = tag.get("src", "N/A")
-        
-        return chapters_dict
+                await page.evaluate(SCROLL_PENDING_JS)
+                try:
+                    await page.wait_for_function(IMAGES_LOADED_JS, timeout=3000, polling=100)
+                    pending = 0
+                except PlaywrightTimeoutError:
+                    pending = await page.evaluate(PROMOTE_LAZY_JS)
+            if pending:
+                print("Couldn't load all imgs")
+                raise PlaywrightTimeoutError(f"{pending} pages still showing the placeholder")
+            html = await self._outer_html(page, "img.ImageContainer")
+
+        return _parse_pages(html, self.html_parser)
     
\ No newline at end of file
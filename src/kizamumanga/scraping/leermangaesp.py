@@ -1,12 +1,14 @@
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
 
-from playwright.async_api import Error, TimeoutError as PlaywrightTimeoutError, Page
+from bs4 import SoupStrainer
+
+from playwright.async_api import Error
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..utils import Logger, extract_num
 from .interface import ScraperInterface
-from .base import ScraperBase, MangaError
+from .base import ScraperBase, MangaError, BrowserLauncher, make_soup, class_strainer
 
 BASE_URL = "https://leermangaesp.com/"
 HEADERS = {
@@ -14,12 +16,68 @@ HEADERS = {
 }
 
 
+def _parse_search(html: str, parser: str = None) -> dict:
+    """Return the search results of ``html`` as {name: URL}."""
+    soup = make_soup(html, parser, class_strainer("manga-item"))
+    mangas = soup.select(".manga-item")
+
+    nl = {}
+    for item in mangas:
+        title = item.find("h3").text
+        nl[title] = urljoin(BASE_URL, item.find("a").get("href"))
+
+    return nl
+
+
+def _parse_chapters(html: str, parser: str = None) -> dict:
+    """Return the chapters of ``html`` as {chapter_name: URL}, sorted by chapter number."""
+    soup = make_soup(html, parser, class_strainer("chapter-link"))
+
+    chapters = soup.select(".chapter-link")
+
+    # Retrieveng mangas
+    nl = {}
+    for item in chapters:
+        url = item.get("href")
+        title = item.get("aria-label")
+        nl[title] = urljoin(BASE_URL, url)
+
+    # Sorting the retrieved mangas
+    sorted_nl = {}
+    for chap in sorted(nl, key=extract_num):
+        sorted_nl[chap] = nl[chap]
+
+    return sorted_nl
+
+
+def _parse_pages(html: str, parser: str = None) -> dict:
+    """Return the page images of ``html`` as {image_name: src}."""
+    soup = make_soup(html, parser, SoupStrainer(id="cascade-view"))
+    imgs = soup.select("#cascade-view img")
+    chapters_dict = {}
+
+    for item in imgs:
+        alt = item.get("alt")
+        src = item.get("src")
+        chapters_dict[alt] = src
+
+    return chapters_dict
+
+
 class LeerMangaEsp(ScraperBase, ScraperInterface):
-    """Scraper for leermangaesp site to fetch manga info and images."""
+    """Scraper for leermangaesp site to fetch manga info and images.
+
+    Chapter lists and chapter pages are server rendered and fetched over
+    HTTP first, the search runs client side and always needs the browser.
+    """
 
-    def __init__(self):
+    def __init__(
+        self, pool_size: int = 5, http_fast_path: bool = True, html_parser: str = None,
+        launcher: BrowserLauncher = None, contexts: int = 1,
+    ):
         """Initialize leermangaesp scraper with logging."""
-        super().__init__()
+        super().__init__(pool_size, http_fast_path, html_parser, launcher, contexts)
+        self.headers = HEADERS
         self.logger = Logger("scraping.weeb_central")
 
     @staticmethod
@@ -35,102 +93,53 @@ class LeerMangaEsp(ScraperBase, ScraperInterface):
         retry_error_callback=__retry_state.__func__,
     )
 
-    async def __close_page(self, page: Page):
-        if page:
-            try:
-                await page.close()
-            except Exception:
-                pass
-
     @retry(**_RETRY_KW)
     async def get_mangas_by_title(self, title: str) -> dict:
         """Search manga by title and return matches as {name: URL}."""
-        page = None
         url = BASE_URL
         try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
-            await page.goto(url, wait_until="domcontentloaded", timeout=10000)
-            await page.wait_for_selector("#searchInput", timeout=1000)
-            await page.fill("#searchInput", title)
-            await page.press("#searchInput", "Enter")
-            await page.wait_for_selector(".manga-item", state="visible", timeout=1000)
-            
-            html = await page.content()
+            async with self._page() as page:
+                await page.goto(url, wait_until="domcontentloaded", timeout=10000)
+                await page.wait_for_selector("#searchInput", timeout=1000)
+                await page.fill("#searchInput", title)
+                await page.press("#searchInput", "Enter")
+                await page.wait_for_selector(".manga-item", state="visible", timeout=1000)
+
+                html = await self._outer_html(page, ".manga-item")
         except Error as e:
             raise MangaError("Manga not found") from e
-        finally:
-            await self.__close_page(page)
-
-        soup = BeautifulSoup(html, "html.parser")
-        mangas = soup.select(".manga-item")
 
-        nl = {}
-        for item in mangas:
-            title = item.find("h3").text
-            url = BASE_URL + item.find("a").get("href")
-            nl[title] = url.replace("//", "/")
-
-        return nl
+        return _parse_search(html, self.html_parser)
 
     @retry(**_RETRY_KW)
     async def get_chapters_by_mangaurl(self, manga_url) -> dict:
         """Return chapters for a manga as {chapter_name: URL}, sorted by chapter number."""
-        page = None
-        try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
+        sorted_nl = await self._try_http("chapter list", manga_url, _parse_chapters)
+        if sorted_nl:
+            return sorted_nl
+
+        async with self._page() as page:
             await page.goto(manga_url, wait_until="domcontentloaded")
-            
+
             await page.wait_for_selector(".chapter-card", state="visible", timeout=1000)
-            
-            html = await page.content()
-
-            soup = BeautifulSoup(html, "html.parser")
-            
-            chapters = soup.select(".chapter-link")
-            
-            # Retrieveng mangas
-            nl = {}
-            for item in chapters:
-                url = item.get("href")
-                title = item.get("aria-label")
-                nl[title] = (BASE_URL + url).replace("//", "/")
-
-            # Sorting the retrieved mangas
-            sorted_nl = {}
-            for chap in sorted(nl, key=extract_num):
-                sorted_nl[chap] = nl[chap]
 
-            return sorted_nl
-        finally:
-            await self.__close_page(page)
+            html = await self._outer_html(page, ".chapter-link")
+
+        return _parse_chapters(html, self.html_parser)
 
     @retry(**_RETRY_KW)
     async def obtain_chapter_content(self, manga_url) -> dict:
         """Get image URLs for a chapter as {image_name: src}."""
-        page = None
-        try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
+        chapters_dict = await self._try_http("chapter content", manga_url, _parse_pages)
+        if chapters_dict:
+            return chapters_dict
 
+        async with self._page() as page:
             await page.goto(manga_url, wait_until="domcontentloaded")
 
-            await page.wait_for_selector(".manga-image", timeout=2000)
-            
-            html = await page.content()
-        except PlaywrightTimeoutError:
-            raise
-        finally:
-            await self.__close_page(page)
-
-        soup = BeautifulSoup(html, "html.parser")
-        imgs = soup.select("#cascade-view img")
-        chapters_dict = {}
-        
-        for item in imgs:
-            alt = item.get("alt")
-            src = item.get("src")
-            chapters_dict[alt] = src
-
-        return chapters_dict
+            # Images are blocked, they never become visible
+            await page.wait_for_selector(".manga-image", state="attached", timeout=2000)
+
+            html = await self._outer_html(page, "#cascade-view")
+
+        return _parse_pages(html, self.html_parser)
@@ -1,12 +1,14 @@
-from bs4 import BeautifulSoup
+import re
 
-from playwright.async_api import Error, TimeoutError as PlaywrightTimeoutError, Page
+from bs4 import SoupStrainer
+
+from playwright.async_api import Error, TimeoutError as PlaywrightTimeoutError
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..utils import Logger, extract_num
 from .interface import ScraperInterface
-from .base import ScraperBase, MangaError
+from .base import ScraperBase, MangaError, BrowserLauncher, make_soup, class_strainer
 
 BASE_URL = "https://weebcentral.com"
 HEADERS = {
@@ -14,12 +16,72 @@ HEADERS = {
 }
 
 
+SEARCH_QUERY = "text={title}&sort=Best+Match&order=Descending&official=Any&anime=Any&adult=Any&display_mode=Full+Display"
+
+
+def _parse_search(html: str, parser: str = None) -> dict:
+    """Return the search results of ``html`` as {name: URL}."""
+    soup = make_soup(html, parser, class_strainer("line-clamp-1", "a"))
+    manga_names = soup.select("a.line-clamp-1")
+
+    nl = {}
+    for item in manga_names:
+        nl[item.text.strip()] = item.get("href", "N/A")
+
+    return nl
+
+
+def _parse_chapters(html: str, parser: str = None) -> dict:
+    """Return the chapters of ``html`` as {chapter_name: URL}, sorted by chapter number."""
+    soup = make_soup(html, parser, SoupStrainer("a"))
+    tags = soup.find_all(
+        "a", class_="hover:bg-base-300 flex-1 flex items-center p-2"
+    )
+    # Retrieveng mangas
+    nl = {}
+    for tag in tags:
+        href = tag.get("href", "N/A")
+        for span in tag.find_all("span"):
+            if span.has_attr("class") and span["class"] == []:
+                nl[span.text.strip()] = href.strip()
+                break
+
+    # Sorting the retrieved mangas
+    sorted_nl = {}
+    for chap in sorted(nl, key=extract_num):
+        sorted_nl[chap] = nl[chap]
+
+    return sorted_nl
+
+
+def _parse_pages(html: str, parser: str = None) -> dict:
+    """Return the page images of ``html`` as {image_name: src}."""
+    soup = make_soup(html, parser, SoupStrainer("img"))
+    tags = soup.find_all("img")
+
+    chapters_dict = {}
+
+    for tag in tags:
+        if tag.has_attr("alt") and "Page" in tag["alt"]:
+            chapters_dict[tag["alt"]] = tag.get("src", "N/A")
+
+    return chapters_dict
+
+
 class WeebCentral(ScraperBase, ScraperInterface):
-    """Scraper for WeebCentral site to fetch manga info and images."""
+    """Scraper for WeebCentral site to fetch manga info and images.
+
+    The site renders its lists with htmx, the fragments it loads are
+    requested directly over HTTP before using the browser.
+    """
 
-    def __init__(self):
+    def __init__(
+        self, pool_size: int = 5, http_fast_path: bool = True, html_parser: str = None,
+        launcher: BrowserLauncher = None, contexts: int = 1,
+    ):
         """Initialize WeebCentral scraper with logging."""
-        super().__init__()
+        super().__init__(pool_size, http_fast_path, html_parser, launcher, contexts)
+        self.headers = HEADERS
         self.logger = Logger("scraping.weeb_central")
 
     @staticmethod
@@ -35,103 +97,79 @@ class WeebCentral(ScraperBase, ScraperInterface):
         retry_error_callback=__retry_state.__func__,
     )
 
-    async def __close_page(self, page: Page):
-        if page:
-            try:
-                await page.close()
-            except Exception:
-                pass
-
     @retry(**_RETRY_KW)
     async def get_mangas_by_title(self, title: str) -> dict:
         """Search manga by title and return matches as {name: URL}."""
-        page = None
-        title = title.replace(" ", "+")
-        url = f"{BASE_URL}/search?text={title}&sort=Best+Match&order=Descending&official=Any&anime=Any&adult=Any&display_mode=Full+Display"
+        query = SEARCH_QUERY.format(title=title.replace(" ", "+"))
+        nl = await self._try_http(
+            "search", f"{BASE_URL}/search/data?limit=32&offset=0&{query}", _parse_search
+        )
+        if nl:
+            return nl
+
+        url = f"{BASE_URL}/search?{query}"
         try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
-            await page.goto(url, wait_until="domcontentloaded", timeout=10000)
-            await page.wait_for_selector(
-                "#search-results > article:nth-child(1)", timeout=1500
-            )
-            html = await page.content()
+            async with self._page() as page:
+                await page.goto(url, wait_until="domcontentloaded", timeout=10000)
+                await page.wait_for_selector(
+                    "#search-results > article:nth-child(1)", timeout=1500
+                )
+                html = await self._outer_html(page, "#search-results")
         except Error as e:
             raise MangaError("Manga not found") from e
-        finally:
-            await self.__close_page(page)
-
-        soup = BeautifulSoup(html, "html.parser")
-        manga_names = soup.select("a.line-clamp-1")
 
-        nl = {}
-        for item in manga_names:
-            nl[item.text.strip()] = item.get("href", "N/A")
-
-        return nl
+        return _parse_search(html, self.html_parser)
 
     @retry(**_RETRY_KW)
     async def get_chapters_by_mangaurl(self, manga_url) -> dict:
         """Return chapters for a manga as {chapter_name: URL}, sorted by chapter number."""
-        page = None
-        try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
+        # The "show all" button loads this fragment
+        series = re.search(r"/series/([^/?#]+)", manga_url)
+        sorted_nl = await self._try_http(
+            "chapter list",
+            f"{BASE_URL}/series/{series.group(1)}/full-chapter-list" if series else None,
+            _parse_chapters,
+        )
+        if sorted_nl:
+            return sorted_nl
+
+        async with self._page() as page:
             await page.goto(manga_url, wait_until="domcontentloaded")
             element = await page.query_selector("#chapter-list > button")
             if element:
-                await page.wait_for_selector("#chapter-list > button")
+                shown = await page.locator("#chapter-list a").count()
                 await page.click("#chapter-list > button")
-                await page.wait_for_timeout(1200)
-            html = await page.content()
-
-            soup = BeautifulSoup(html, "html.parser")
-            tags = soup.find_all(
-                "a", class_="hover:bg-base-300 flex-1 flex items-center p-2"
-            )
-            # Retrieveng mangas
-            nl = {}
-            for tag in tags:
-                href = tag.get("href", "N/A")
-                for span in tag.find_all("span"):
-                    if span.has_attr("class") and span["class"] == []:
-                        nl[span.text.strip()] = href.strip()
-                        break
-
-            # Sorting the retrieved mangas
-            sorted_nl = {}
-            for chap in sorted(nl, key=extract_num):
-                sorted_nl[chap] = nl[chap]
-
-            return sorted_nl
-        finally:
-            await self.__close_page(page)
+                try:
+                    # The full list replaces the first chapters once loaded
+                    await page.wait_for_function(
+                        "n => document.querySelectorAll('#chapter-list a').length > n",
+                        arg=shown, timeout=5000,
+                    )
+                except PlaywrightTimeoutError:
+                    self.logger.warning("Full chapter list didn't load, using the chapters shown")
+                await self._wait_until_stable(page, "#chapter-list a", timeout=2000)
+            html = await self._outer_html(page, "#chapter-list")
+
+        return _parse_chapters(html, self.html_parser)
 
     @retry(**_RETRY_KW)
     async def obtain_chapter_content(self, manga_url) -> dict:
         """Get image URLs for a chapter as {image_name: src}."""
-        page = None
-        try:
-            page = await self.context.new_page()
-            await page.set_extra_http_headers(HEADERS)
-
+        # The reader loads its images from this fragment
+        chapters_dict = await self._try_http(
+            "chapter content",
+            f"{manga_url.rstrip('/')}/images?is_prev=False&current_page=1&reading_style=long_strip",
+            _parse_pages,
+        )
+        if chapters_dict:
+            return chapters_dict
+
+        async with self._page() as page:
             await page.goto(manga_url, wait_until="domcontentloaded")
 
-            await page.wait_for_timeout(2000)
-            await page.wait_for_selector("img[alt *= 'Page']", timeout=5000)
-            html = await page.content()
-        except PlaywrightTimeoutError:
-            raise
-        finally:
-            await self.__close_page(page)
-
-        soup = BeautifulSoup(html, "html.parser")
-        tags = soup.find_all("img")
-
-        chapters_dict = {}
-
-        for tag in tags:
-            if tag.has_attr("alt") and "Page" in tag["alt"]:
-                chapters_dict[tag["alt"]] = tag.get("src", "N/A")
+            # Images are blocked, they never become visible
+            await page.wait_for_selector("img[alt *= 'Page']", state="attached", timeout=5000)
+            await self._wait_until_stable(page, "img[alt *= 'Page']")
+            html = await self._outer_html(page, "img[alt *= 'Page']")
 
-        return chapters_dict
+        return _parse_pages(html, self.html_parser)
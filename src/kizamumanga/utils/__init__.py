@@ -1,4 +1,5 @@
-from .general_tools import export_to_cbz, extract_num
+from .general_tools import extract_num
+from .cbz_writer import CBZWriter
 from .loading_spinner import LoadingSpinner
 from .ascii import Ascii
 from .logger import Logger
\ No newline at end of file
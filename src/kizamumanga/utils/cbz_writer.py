@@ -0,0 +1,170 @@
+"""CBZ writer that stores chapter pages as they are processed and packs them once complete."""
+
+import hashlib
+import json
+import os
+import shutil
+from zipfile import ZipFile
+
+from .logger import Logger
+
+logger = Logger("utils.cbz_writer")
+
+
+class CBZWriter:
+    """Collects the pages of a chapter and packs them into a CBZ archive in reading order.
+
+    Pages may arrive in any order. Each one is written to its own file in
+    ``<work_path>/<filename>/`` as soon as it arrives, so nothing is held in
+    memory and a page on disk is never damaged by a later write.
+
+    ``checkpoint`` (and ``close`` on an incomplete chapter) records the stored
+    pages (name, size and SHA-256) in a JSON manifest next to that folder, so
+    the next run only fetches the missing pages. A run killed before its
+    checkpoint loses only the pages it fetched itself. Once every page is
+    stored, the CBZ is written to ``destination_path`` and the work files
+    are removed.
+    """
+
+    def __init__(self, work_path, destination_path, filename):
+        """Prepare ``<work_path>/<filename>/``, resuming it if a manifest exists."""
+        self.pages_path = os.path.normpath(f"{work_path}/{filename}")
+        self.manifest_path = os.path.normpath(f"{work_path}/{filename}.json")
+        # Single archive written by earlier versions, never resumed
+        self.legacy_zip_path = os.path.normpath(f"{work_path}/{filename}.zip")
+        self.cbz_path = os.path.normpath(f"{destination_path}/{filename}.cbz")
+        self.filename = filename
+        self._manifest = self.__load_manifest()
+        os.makedirs(self.pages_path, exist_ok=True)
+
+    @property
+    def completed(self) -> set:
+        """Indexes of the pages already stored."""
+        return {int(index) for index in self._manifest["pages"]}
+
+    def resume(self, total: int, source: str = None) -> set:
+        """Bind the chapter to ``total`` pages and return the stored indexes.
+
+        Pages stored for a different page count, or taken from another
+        ``source`` website, are discarded and the chapter starts over so
+        scans of different sources are never mixed.
+        """
+        if self._manifest["total"] not in (None, total):
+            logger.warning(
+                f"{self.filename}: page count changed from {self._manifest['total']} to {total}, restarting"
+            )
+            self.__restart()
+        elif source and self._manifest.get("source") not in (None, source):
+            logger.warning(
+                f"{self.filename}: pages now come from {source} instead of {self._manifest['source']}, restarting"
+            )
+            self.__restart()
+
+        self._manifest["total"] = total
+        if source:
+            self._manifest["source"] = source
+        completed = self.completed
+        if completed:
+            logger.info(f"{self.filename}: resuming with {len(completed)}/{total} pages")
+        return completed
+
+    @property
+    def is_complete(self) -> bool:
+        """True once every page of the chapter is stored."""
+        total = self._manifest["total"]
+        return total is not None and len(self._manifest["pages"]) == total
+
+    def add(self, index: int, arcname: str, data: bytes):
+        """Store page ``index`` under ``arcname``, written to its own file right away."""
+        path = os.path.join(self.pages_path, arcname)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._manifest["pages"][str(index)] = {
+            "name": arcname,
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+
+    def close(self) -> bool:
+        """Finish the chapter, returning False if pages are still missing.
+
+        A complete chapter is packed into its final ``.cbz`` and the work
+        files are removed; otherwise the stored pages are checkpointed for
+        the next run.
+        """
+        if not self.is_complete:
+            self.checkpoint()
+            if self._manifest["pages"]:
+                logger.warning(
+                    f"{self.filename}: {len(self._manifest['pages'])}/{self._manifest['total']} pages saved, kept for resume"
+                )
+            return False
+
+        if not os.path.exists(self.cbz_path):
+            self.__pack()
+        else:
+            logger.error(f"File {self.filename}.cbz already exists")
+        self.__remove_files()
+        return True
+
+    def checkpoint(self):
+        """Record the pages stored so far, so the next run resumes after them."""
+        if self._manifest["pages"]:
+            self.__save_manifest()
+        else:
+            self.__remove_files()
+
+    def __pack(self):
+        """Write the pages in reading order into the final archive."""
+        tmp_path = f"{self.cbz_path}.tmp"
+        with ZipFile(tmp_path, "w") as zipf:
+            for index in sorted(self._manifest["pages"], key=int):
+                name = self._manifest["pages"][index]["name"]
+                zipf.write(os.path.join(self.pages_path, name), arcname=name)
+        os.replace(tmp_path, self.cbz_path)
+
+    def __restart(self):
+        """Drop the pages stored so far."""
+        self.__remove_files()
+        self._manifest = {"total": None, "pages": {}}
+        os.makedirs(self.pages_path, exist_ok=True)
+
+    def __remove_files(self):
+        """Delete the page folder and manifest from the work folder."""
+        shutil.rmtree(self.pages_path, ignore_errors=True)
+        for path in (self.manifest_path, self.legacy_zip_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __load_manifest(self) -> dict:
+        """Return the manifest of a previous run, keeping only the pages still on disk."""
+        empty = {"total": None, "pages": {}}
+        if not os.path.exists(self.manifest_path):
+            return empty
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            pages = manifest["pages"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"{self.filename}: unusable checkpoint, restarting ({e})")
+            return empty
+
+        missing = 0
+        for index, page in list(pages.items()):
+            path = os.path.join(self.pages_path, page["name"])
+            if not os.path.exists(path) or os.path.getsize(path) != page["size"]:
+                del pages[index]
+                missing += 1
+        if missing:
+            logger.warning(f"{self.filename}: {missing} checkpointed pages missing, fetching them again")
+        return manifest
+
+    def __save_manifest(self):
+        """Atomically write the manifest next to the page folder."""
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp_path, self.manifest_path)
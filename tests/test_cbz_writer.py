@@ -0,0 +1,144 @@
+"""Tests for CBZWriter: storing pages, checkpoints and resuming interrupted chapters."""
+
+import os
+import subprocess
+import sys
+import textwrap
+from zipfile import ZipFile
+
+from kizamumanga.utils import CBZWriter
+
+SRC_PATH = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def page(index: int) -> bytes:
+    return f"page {index}".encode() * (index + 1)
+
+
+def make_writer(tmp_path, filename="Chapter 1"):
+    return CBZWriter(tmp_path / "work", tmp_path / "out", filename)
+
+
+def read_cbz(writer) -> list:
+    with ZipFile(writer.cbz_path) as zipf:
+        return [(name, zipf.read(name)) for name in zipf.namelist()]
+
+
+def setup_dirs(tmp_path):
+    (tmp_path / "work").mkdir()
+    (tmp_path / "out").mkdir()
+
+
+def test_pages_are_packed_in_reading_order(tmp_path):
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    assert writer.resume(4) == set()
+    for index in (2, 0, 3, 1):
+        writer.add(index, f"{index:03d}.png", page(index))
+
+    assert writer.is_complete
+    assert writer.close()
+    assert read_cbz(writer) == [(f"{i:03d}.png", page(i)) for i in range(4)]
+    # Work files are gone once the CBZ exists
+    assert os.listdir(tmp_path / "work") == []
+
+
+def test_incomplete_chapter_resumes_from_checkpoint(tmp_path):
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    writer.resume(3, source="site_a")
+    writer.add(2, "002.png", page(2))
+    writer.add(0, "000.png", page(0))
+    assert not writer.close()
+    assert os.path.exists(writer.manifest_path)
+    assert not os.path.exists(writer.cbz_path)
+
+    writer = make_writer(tmp_path)
+    assert writer.resume(3, source="site_a") == {0, 2}
+    writer.add(1, "001.png", page(1))
+    assert writer.close()
+    assert read_cbz(writer) == [(f"{i:03d}.png", page(i)) for i in range(3)]
+
+
+def test_page_count_change_restarts(tmp_path):
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    writer.resume(3)
+    writer.add(0, "000.png", page(0))
+    writer.checkpoint()
+
+    writer = make_writer(tmp_path)
+    assert writer.resume(5) == set()
+    assert not os.path.exists(os.path.join(writer.pages_path, "000.png"))
+
+
+def test_source_change_restarts(tmp_path):
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    writer.resume(3, source="site_a")
+    writer.add(0, "000.png", page(0))
+    writer.checkpoint()
+
+    assert make_writer(tmp_path).resume(3, source="site_b") == set()
+
+
+def test_missing_or_truncated_pages_are_fetched_again(tmp_path):
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    writer.resume(3)
+    for index in range(2):
+        writer.add(index, f"{index:03d}.png", page(index))
+    writer.checkpoint()
+    os.remove(os.path.join(writer.pages_path, "000.png"))
+    with open(os.path.join(writer.pages_path, "001.png"), "wb") as f:
+        f.write(b"cut")
+
+    assert make_writer(tmp_path).resume(3) == set()
+
+
+def test_unusable_manifest_restarts(tmp_path):
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    with open(writer.manifest_path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    assert make_writer(tmp_path).resume(2) == set()
+
+
+def test_checkpoint_without_pages_removes_work_files(tmp_path):
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    writer.resume(2)
+    assert not writer.close()
+    assert os.listdir(tmp_path / "work") == []
+
+
+def test_resume_after_killed_run(tmp_path):
+    """A run killed mid chapter loses only the pages it fetched after the last checkpoint."""
+    setup_dirs(tmp_path)
+    writer = make_writer(tmp_path)
+    writer.resume(4)
+    writer.add(0, "000.png", page(0))
+    writer.add(1, "001.png", page(1))
+    writer.checkpoint()
+
+    # Resume, store one more page and die without any cleanup
+    script = textwrap.dedent(
+        f"""
+        import os
+        from kizamumanga.utils import CBZWriter
+        writer = CBZWriter({str(tmp_path / "work")!r}, {str(tmp_path / "out")!r}, "Chapter 1")
+        assert writer.resume(4) == {{0, 1}}
+        writer.add(2, "002.png", {page(2)!r})
+        os._exit(0)
+        """
+    )
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC_PATH))
+    subprocess.run([sys.executable, "-c", script], check=True, env=env)
+
+    writer = make_writer(tmp_path)
+    assert writer.resume(4) == {0, 1}
+    for index in (3, 2):
+        writer.add(index, f"{index:03d}.png", page(index))
+    assert writer.close()
+    assert read_cbz(writer) == [(f"{i:03d}.png", page(i)) for i in range(4)]
@@ -0,0 +1,136 @@
+"""Tests for AdaptiveLimit (AIMD window) and the overload classification."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from kizamumanga.engine.concurrency import AdaptiveLimit, is_overload
+
+
+def response_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+
+def record_window(limit, ok=True, latency=0.1):
+    for _ in range(max(limit.window, limit.limit)):
+        limit.record(ok, latency)
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (asyncio.TimeoutError(), True),
+        (response_error(429), True),
+        (response_error(500), True),
+        (response_error(503), True),
+        (response_error(404), False),
+        (response_error(403), False),
+        (ValueError("broken image"), False),
+    ],
+)
+def test_is_overload(error, expected):
+    assert is_overload(error) is expected
+
+
+def test_starts_at_half_the_ceiling():
+    assert AdaptiveLimit("test", 8).limit == 4
+    assert AdaptiveLimit("test", 1).limit == 1
+    assert AdaptiveLimit("test", 8, adaptive=False).limit == 8
+
+
+def test_additive_increase_up_to_ceiling():
+    limit = AdaptiveLimit("test", 6, window=4)
+    for expected in (4, 5, 6, 6):
+        record_window(limit)
+        assert limit.limit == expected
+
+
+def test_no_change_before_the_window_ends():
+    limit = AdaptiveLimit("test", 8, window=4)
+    for _ in range(3):
+        limit.record(True, 0.1)
+    assert limit.limit == 4
+
+
+def test_overloads_halve_the_limit():
+    limit = AdaptiveLimit("test", 16, window=4)
+    record_window(limit, ok=False)
+    assert limit.limit == 4
+    record_window(limit, ok=False)
+    assert limit.limit == 2
+    record_window(limit, ok=False)
+    record_window(limit, ok=False)
+    assert limit.limit == 1
+
+
+def test_rare_overloads_still_increase():
+    limit = AdaptiveLimit("test", 40, window=20)
+    # 1 in 20 is under the 10% error rate
+    for n in range(20):
+        limit.record(n != 0, 0.1)
+    assert limit.limit == 21
+
+
+def test_latency_doubling_halves_the_limit():
+    limit = AdaptiveLimit("test", 16, window=4)
+    record_window(limit, latency=0.1)
+    assert limit.limit == 9
+    record_window(limit, latency=0.3)
+    assert limit.limit == 4
+
+
+def test_not_adaptive_never_moves():
+    limit = AdaptiveLimit("test", 8, adaptive=False, window=4)
+    record_window(limit, ok=False)
+    assert limit.limit == 8
+
+
+def test_caps_tasks_in_flight():
+    peak = 0
+
+    async def task(limit):
+        nonlocal peak
+        async with limit:
+            peak = max(peak, limit.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        limit = AdaptiveLimit("test", 6)
+        await asyncio.gather(*(task(limit) for _ in range(20)))
+        assert limit.in_flight == 0
+
+    asyncio.run(main())
+    assert peak == 3
+
+
+def test_raised_limit_wakes_waiters():
+    async def main():
+        limit = AdaptiveLimit("test", 4, window=2)
+        await limit.__aenter__()
+        await limit.__aenter__()
+        waiter = asyncio.create_task(limit.__aenter__())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        # A healthy window raises the limit to 3, room for the waiter
+        record_window(limit)
+        await asyncio.wait_for(waiter, 1)
+        assert limit.in_flight == 3
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_leaves_no_trace():
+    async def main():
+        limit = AdaptiveLimit("test", 2)
+        await limit.__aenter__()
+        waiter = asyncio.create_task(limit.__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert not limit._waiters
+        await limit.__aexit__(None, None, None)
+        assert limit.in_flight == 0
+
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""Tests for Retry-After parsing, backoff delays and the per-host rate limiter."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import time
+
+import pytest
+
+from kizamumanga.engine.rate_limiter import (
+    MAX_RETRY_AFTER,
+    HostRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("5", 5.0),
+        (" 12 ", 12.0),
+        ("0", 0.0),
+        ("100000", MAX_RETRY_AFTER),
+        (None, None),
+        ("", None),
+        ("soon", None),
+        ("-3", None),
+        ("1.5", None),
+    ],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+
+def test_parse_retry_after_past_date():
+    when = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert parse_retry_after(format_datetime(when, usegmt=True)) == 0.0
+
+
+def test_backoff_delay_grows_and_is_capped():
+    for attempt in range(10):
+        bound = min(30.0, 0.5 * 2 ** attempt)
+        delays = [backoff_delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+    assert all(backoff_delay(3, base=1, cap=2) <= 2 for _ in range(200))
+
+
+def test_backoff_delay_is_jittered():
+    assert len({backoff_delay(4) for _ in range(20)}) > 1
+
+
+def elapsed(coro_factory) -> float:
+    async def main():
+        start = time.monotonic()
+        await coro_factory()
+        return time.monotonic() - start
+
+    return asyncio.run(main())
+
+
+def test_burst_then_rate():
+    limiter = HostRateLimiter(rate=20, burst=5)
+
+    async def requests():
+        for _ in range(10):
+            await limiter.acquire("https://img.example.com/1.png")
+
+    # 5 from the burst, the other 5 at 20 per second
+    assert 0.2 <= elapsed(requests) < 0.5
+
+
+def test_hosts_have_their_own_bucket():
+    limiter = HostRateLimiter(rate=1, burst=1)
+
+    async def requests():
+        for n in range(5):
+            await limiter.acquire(f"https://img{n}.example.com/1.png")
+
+    assert elapsed(requests) < 0.1
+
+
+def test_zero_rate_is_unlimited():
+    limiter = HostRateLimiter(rate=0)
+
+    async def requests():
+        for _ in range(100):
+            await limiter.acquire("https://img.example.com/1.png")
+
+    assert elapsed(requests) < 0.1
+
+
+def test_pause_holds_only_its_host():
+    limiter = HostRateLimiter(rate=0)
+    limiter.pause("https://slow.example.com/1.png", 0.3)
+
+    async def other_host():
+        await limiter.acquire("https://fast.example.com/1.png")
+
+    async def paused_host():
+        await limiter.wait_resume("https://slow.example.com/2.png")
+        await limiter.acquire("https://slow.example.com/2.png")
+
+    assert elapsed(other_host) < 0.1
+    assert 0.25 <= elapsed(paused_host) < 0.5
+
+
+def test_shorter_pause_does_not_cut_a_longer_one():
+    limiter = HostRateLimiter(rate=0)
+    limiter.pause("https://img.example.com/1.png", 0.3)
+    limiter.pause("https://img.example.com/1.png", 0.01)
+
+    async def request():
+        await limiter.acquire("https://img.example.com/1.png")
+
+    assert elapsed(request) >= 0.25
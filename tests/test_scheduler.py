@@ -0,0 +1,113 @@
+"""Tests for the work-queue Scheduler: job order, stop markers, backpressure and errors."""
+
+import asyncio
+
+import pytest
+
+from kizamumanga.engine.scheduler import Scheduler
+
+
+def run_jobs(jobs, order="ascending", workers=1):
+    """Submit ``jobs`` as (name, index, priority) before starting, return the handling order."""
+    handled = []
+
+    async def handler(job):
+        handled.append(job)
+
+    async def main():
+        scheduler = Scheduler("test", workers, handler, order=order)
+        for name, index, priority in jobs:
+            await scheduler.submit(name, index=index, priority=priority)
+        scheduler.start()
+        await scheduler.join()
+
+    asyncio.run(main())
+    return handled
+
+
+def test_ascending_order():
+    assert run_jobs([("c", 3, 0), ("a", 1, 0), ("b", 2, 0)]) == ["a", "b", "c"]
+
+
+def test_newest_first_order():
+    assert run_jobs([("a", 1, 0), ("c", 3, 0), ("b", 2, 0)], order="newest_first") == ["c", "b", "a"]
+
+
+def test_priority_beats_index():
+    jobs = [("a", 1, 0), ("b", 2, 5), ("c", 3, 0), ("d", 4, 5)]
+    assert run_jobs(jobs) == ["b", "d", "a", "c"]
+
+
+def test_equal_jobs_keep_submission_order():
+    # Jobs that can't be compared must never be, the counter breaks the tie
+    jobs = [({"n": n}, 0, 0) for n in range(5)]
+    assert run_jobs(jobs) == [{"n": n} for n in range(5)]
+
+
+def test_stop_markers_run_after_every_job():
+    jobs = [(n, n, 0) for n in range(20)]
+    assert sorted(run_jobs(jobs, workers=4)) == list(range(20))
+
+
+def test_invalid_order():
+    with pytest.raises(ValueError):
+        Scheduler("test", 1, None, order="random")
+
+
+def test_submit_after_close():
+    async def main():
+        async with Scheduler("test", 1, asyncio.sleep) as scheduler:
+            scheduler.close()
+            with pytest.raises(RuntimeError):
+                await scheduler.submit(0)
+
+    asyncio.run(main())
+
+
+def test_maxsize_holds_back_submit():
+    submitted = []
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def handler(job):
+            await gate.wait()
+
+        async with Scheduler("test", 1, handler, maxsize=2) as scheduler:
+
+            async def feed():
+                for n in range(5):
+                    await scheduler.submit(n, index=n)
+                    submitted.append(n)
+
+            feeder = asyncio.create_task(feed())
+            await asyncio.sleep(0.05)
+            # One job in the handler, two queued, the fourth waits for room
+            assert submitted == [0, 1, 2]
+            gate.set()
+            await feeder
+            await scheduler.join()
+        assert submitted == list(range(5))
+
+    asyncio.run(main())
+
+
+def test_handler_error_cancels_the_others():
+    started = []
+
+    async def handler(job):
+        started.append(job)
+        if job == 0:
+            raise RuntimeError("broken job")
+        await asyncio.sleep(10)
+
+    async def main():
+        async with Scheduler("test", 2, handler) as scheduler:
+            for n in range(4):
+                await scheduler.submit(n, index=n)
+            with pytest.raises(RuntimeError, match="broken job"):
+                await asyncio.wait_for(scheduler.join(), 5)
+
+    asyncio.run(main())
+    # The worker left running is cancelled, the rest is never handled
+    assert started == [0, 1]